@@ -15,6 +15,8 @@
 """Interacts with FuzzIntrospector APIs"""
 
 import argparse
+import copy
+import functools
 import json
 import logging
 import os
@@ -22,7 +24,9 @@ import random
 import re
 import subprocess
 import sys
+import threading
 import time
+from multiprocessing import pool
 from typing import Any, Dict, List, Optional, TypeVar
 from urllib.parse import urlencode
 
@@ -37,6 +41,11 @@ T = TypeVar('T', str, list, dict, int)  # Generic type.
 
 TIMEOUT = 45
 MAX_RETRY = 5
+# Maximum number of introspector queries issued in parallel by one caller.
+MAX_CONCURRENT_QUERIES = 8
+# Fields identifying a function when deduplicating fuzz target functions.
+FUNCTION_KEY_FIELDS = ('function-name', 'source-file', 'return-type',
+                       'arg-list')
 
 # By default exclude static functions when identifying fuzz target candidates
 # to generate benchmarks.
@@ -118,12 +127,37 @@ def _construct_url(api: str, params: dict) -> str:
   return api + '?' + urlencode(params)
 
 
+# The (pid, session) of this process. The session is shared by all threads so
+# that keep-alive connections outlive the short-lived ThreadPools issuing
+# concurrent queries, but never with forked children (e.g. the experiment
+# Pool), which would otherwise read and write the inherited sockets.
+_session: Optional[tuple[int, requests.Session]] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+  """Returns the FuzzIntrospector session of this process."""
+  global _session
+  pid = os.getpid()
+  with _session_lock:
+    if _session is None or _session[0] != pid:
+      session = requests.Session()
+      # Sized for the maximum number of concurrent queries.
+      adapter = requests.adapters.HTTPAdapter(
+          pool_connections=MAX_CONCURRENT_QUERIES,
+          pool_maxsize=MAX_CONCURRENT_QUERIES)
+      session.mount('http://', adapter)
+      session.mount('https://', adapter)
+      _session = (pid, session)
+    return _session[1]
+
+
 def _query_introspector(api: str, params: dict) -> Optional[requests.Response]:
   """Queries FuzzIntrospector API and returns the json payload,
   returns an empty dict if unable to get data."""
   for attempt_num in range(1, MAX_RETRY + 1):
     try:
-      resp = requests.get(api, params, timeout=TIMEOUT)
+      resp = _get_session().get(api, params=params, timeout=TIMEOUT)
       if not resp.ok:
         logging.error(
             'Failed to get data from FI:\n'
@@ -156,6 +190,51 @@ def _query_introspector(api: str, params: dict) -> Optional[requests.Response]:
   return None
 
 
+class _IntrospectorQueryError(Exception):
+  """Raised when a memoized FuzzIntrospector query fails, so that the failure
+  is not cached and the query is retried on the next lookup."""
+
+
+# The endpoint is part of the cache key so that switching endpoints with
+# set_introspector_endpoints() never returns stale payloads.
+@functools.lru_cache(maxsize=2048)
+def _query_introspector_payload(api: str,
+                                params: tuple[tuple[str, Any], ...]) -> dict:
+  """Queries FuzzIntrospector API and returns the parsed json payload, raises
+  _IntrospectorQueryError if unable to get data."""
+  resp = _query_introspector(api, dict(params))
+  if not resp:
+    raise _IntrospectorQueryError(_construct_url(api, dict(params)))
+
+  try:
+    return resp.json()
+  except requests.exceptions.InvalidJSONError as err:
+    logging.error(
+        'Unable to parse response from FI:\n'
+        '%s\n'
+        '-----------Response received------------\n'
+        '%s\n'
+        '------------End of response-------------', resp.url,
+        resp.content.decode('utf-8').strip())
+    raise _IntrospectorQueryError(resp.url) from err
+
+
+def _get_memoized_data(api: str, params: dict, key: str,
+                       default_value: T) -> T:
+  """Gets the value specified by |key| from a memoized query of |api| with
+  |params|. Used for payloads that do not change during an experiment but are
+  requested repeatedly, e.g., the source and signature of the same function.
+  Only successful queries are memoized."""
+  try:
+    data = _query_introspector_payload(api, tuple(params.items()))
+  except _IntrospectorQueryError:
+    return default_value
+
+  # Copy so that callers cannot mutate the memoized payload.
+  return copy.deepcopy(
+      _get_payload_data(data, key, default_value, _construct_url(api, params)))
+
+
 def _get_data(resp: Optional[requests.Response], key: str,
               default_value: T) -> T:
   """Gets the value specified by |key| from a Request |resp|."""
@@ -174,13 +253,18 @@ def _get_data(resp: Optional[requests.Response], key: str,
         resp.content.decode('utf-8').strip())
     return default_value
 
+  return _get_payload_data(data, key, default_value, resp.url)
+
+
+def _get_payload_data(data: dict, key: str, default_value: T, url: str) -> T:
+  """Gets the value specified by |key| from a parsed FI payload |data|."""
   content = data.get(key)
   if content:
     return content
 
   logging.error('Failed to get %s from FI:\n'
                 '%s\n'
-                '%s', key, resp.url, data)
+                '%s', key, url, data)
   return default_value
 
 
@@ -230,29 +314,27 @@ def query_introspector_cfg(project: str) -> dict:
 
 def query_introspector_source_file_path(project: str, func_sig: str) -> str:
   """Queries FuzzIntrospector API for file path of |func_sig|."""
-  resp = _query_introspector(INTROSPECTOR_FUNCTION_SOURCE, {
+  return _get_memoized_data(INTROSPECTOR_FUNCTION_SOURCE, {
       'project': project,
       'function_signature': func_sig
-  })
-  return _get_data(resp, 'filepath', '')
+  }, 'filepath', '')
 
 
 def query_introspector_function_source(project: str, func_sig: str) -> str:
   """Queries FuzzIntrospector API for source code of |func_sig|."""
-  resp = _query_introspector(INTROSPECTOR_FUNCTION_SOURCE, {
+  return _get_memoized_data(INTROSPECTOR_FUNCTION_SOURCE, {
       'project': project,
       'function_signature': func_sig
-  })
-  return _get_data(resp, 'source', '')
+  }, 'source', '')
 
 
 def query_introspector_function_line(project: str, func_sig: str) -> list:
   """Queries FuzzIntrospector API for source line of |func_sig|."""
-  resp = _query_introspector(INTROSPECTOR_FUNCTION_SOURCE, {
-      'project': project,
-      'function_signature': func_sig
-  })
-  return [_get_data(resp, 'src_begin', 0), _get_data(resp, 'src_end', 0)]
+  params = {'project': project, 'function_signature': func_sig}
+  return [
+      _get_memoized_data(INTROSPECTOR_FUNCTION_SOURCE, params, 'src_begin', 0),
+      _get_memoized_data(INTROSPECTOR_FUNCTION_SOURCE, params, 'src_end', 0)
+  ]
 
 
 def query_introspector_source_code(project: str, filepath: str, begin_line: int,
@@ -273,10 +355,10 @@ def query_introspector_source_code(project: str, filepath: str, begin_line: int,
 
 def query_introspector_header_files(project: str) -> List[str]:
   """Queries for the header files used in a given project."""
-  resp = _query_introspector(INTROSPECTOR_ALL_HEADER_FILES,
-                             {'project': project})
-  all_header_files = _get_data(resp, 'all-header-files', [])
-  return all_header_files
+  # The header list of a project does not change but is needed for every
+  # prompt and missing-header fix.
+  return _get_memoized_data(INTROSPECTOR_ALL_HEADER_FILES,
+                            {'project': project}, 'all-header-files', [])
 
 
 def query_introspector_sample_xrefs(project: str, func_sig: str) -> List[str]:
@@ -316,33 +398,41 @@ def query_introspector_cross_references(project: str,
       'function_signature': func_sig
   })
   call_sites = _get_data(resp, 'callsites', [])
+  if not call_sites:
+    return []
+
+  # Callsites in the same caller yield the same source, so keep one per caller.
+  src_funcs = list(dict.fromkeys(cs.get('src_func') for cs in call_sites))
+  logging.debug('%d callsites of %s in %d distinct callers.', len(call_sites),
+                func_sig, len(src_funcs))
 
-  xref_source = []
-  for cs in call_sites:
-    name = cs.get('src_func')
+  def _query_callsite_source(name: str) -> str:
     sig = query_introspector_function_signature(project, name)
-    source = query_introspector_function_source(project, sig)
-    xref_source.append(source)
-  return xref_source
+    return query_introspector_function_source(project, sig)
+
+  # Each callsite needs two dependent queries but callsites are independent
+  # of each other, so fetch them concurrently and keep the callsite order.
+  with pool.ThreadPool(min(len(src_funcs), MAX_CONCURRENT_QUERIES)) as p:
+    return p.map(_query_callsite_source, src_funcs)
 
 
 def query_introspector_type_info(project: str, type_name: str) -> list[dict]:
   """Queries FuzzIntrospector API for information of |type_name|."""
-  resp = _query_introspector(INTROSPECTOR_TYPE, {
+  # The same types are looked up for header inclusion, type definitions and
+  # every no-member fix.
+  return _get_memoized_data(INTROSPECTOR_TYPE, {
       'project': project,
       'name': type_name
-  })
-  return _get_data(resp, 'type_data', [])
+  }, 'type_data', [])
 
 
 def query_introspector_function_signature(project: str,
                                           function_name: str) -> str:
   """Queries FuzzIntrospector API for signature of |function_name|."""
-  resp = _query_introspector(INTROSPECTOR_FUNC_SIG, {
+  return _get_memoized_data(INTROSPECTOR_FUNC_SIG, {
       'project': project,
       'function': function_name
-  })
-  return _get_data(resp, 'signature', '')
+  }, 'signature', '')
 
 
 def query_introspector_addr_type_info(project: str, addr: str) -> str:
@@ -362,6 +452,9 @@ def get_unreached_functions(project):
   return functions
 
 
+# Functions reached by several fuzzers are demangled once per fuzzer, and each
+# call spawns a c++filt process, so cache the results.
+@functools.lru_cache(maxsize=4096)
 def demangle(name: str) -> str:
   return subprocess.run(['c++filt', name],
                         check=True,
@@ -529,6 +622,15 @@ def populate_benchmarks_using_introspector(project: str, language: str,
   logging.info('Fuzz target binary found for project %s: %s', project,
                target_name)
 
+  # Look these up once rather than rescanning them for every function.
+  src_path_list = set()
+  interesting_basenames = set()
+  if language == 'jvm':
+    # Retrieve list of source file from introspector
+    src_path_list = set(query_introspector_jvm_source_path(project))
+  else:
+    interesting_basenames = {os.path.basename(i) for i in interesting.keys()}
+
   potential_benchmarks = []
   for function in functions:
     if _get_arg_count(function) == 0:
@@ -539,8 +641,6 @@ def populate_benchmarks_using_introspector(project: str, language: str,
     filename = os.path.basename(function['function_filename'])
 
     if language == 'jvm':
-      # Retrieve list of source file from introspector
-      src_path_list = query_introspector_jvm_source_path(project)
       if src_path_list:
         # For all JVM projects, the full class name is stored in the filename
         # field. The full class name includes the package of the class and that
@@ -551,7 +651,7 @@ def populate_benchmarks_using_introspector(project: str, language: str,
         if src_file not in src_path_list:
           logging.error('error: %s %s', filename, interesting.keys())
           continue
-    elif filename not in [os.path.basename(i) for i in interesting.keys()]:
+    elif filename not in interesting_basenames:
       # TODO: Bazel messes up paths to include "/proc/self/cwd/..."
       logging.error('error: %s %s', filename, interesting.keys())
       continue
@@ -584,7 +684,7 @@ def populate_benchmarks_using_introspector(project: str, language: str,
 def pick_one(d: dict):
   if not d:
     return None
-  return list(d.keys())[0]
+  return next(iter(d))
 
 
 def get_target_name(project_name: str, harness: str) -> Optional[str]:
@@ -627,13 +727,10 @@ def _extract_introspector_report(project_name):
   return introspector_report
 
 
-def _contains_function(funcs: List[Dict], target_func: Dict):
-  """Returns True if |funcs| contains |target_func|, vice versa."""
-  key_fields = ['function-name', 'source-file', 'return-type', 'arg-list']
-  for func in funcs:
-    if all(func.get(field) == target_func.get(field) for field in key_fields):
-      return True
-  return False
+def _function_key(func: Dict) -> tuple:
+  """Returns a hashable key identifying |func|."""
+  values = (func.get(field) for field in FUNCTION_KEY_FIELDS)
+  return tuple(tuple(v) if isinstance(v, list) else v for v in values)
 
 
 def _postprocess_function(target_func: dict, project_name: str):
@@ -661,21 +758,28 @@ def get_project_funcs(project_name: str) -> Dict[str, List[Dict]]:
   # Group functions by target files.
   annotated_cfg = introspector_json_report.get('analyses').get('AnnotatedCFG')
   fuzz_target_funcs = {}
+  # Keys of the functions in each target file, to test for duplicates in O(1).
+  fuzz_target_func_keys = {}
   for fuzzer in annotated_cfg:
+    # Group functions by fuzz target source code file, because there may
+    # be multiple functions in the same fuzz target file. Resolve the file's
+    # entries once per fuzzer rather than once per function.
+    fuzz_target_file = annotated_cfg[fuzzer]['src_file']
+    funcs = fuzz_target_funcs.get(fuzz_target_file, [])
+    func_keys = fuzz_target_func_keys.setdefault(fuzz_target_file, set())
     for target_func in annotated_cfg[fuzzer]['destinations']:
       # Remove functions where there are no source file, e.g. libc functions
       if target_func['source-file'] == '':
         continue
 
-      # Group functions by fuzz target source code file, because there may
-      # be multiple functions in the same fuzz target file.
-      fuzz_target_file = annotated_cfg[fuzzer]['src_file']
-      if fuzz_target_file not in fuzz_target_funcs:
-        fuzz_target_funcs[fuzz_target_file] = []
-      if _contains_function(fuzz_target_funcs[fuzz_target_file], target_func):
+      if _function_key(target_func) in func_keys:
         continue
       _postprocess_function(target_func, project_name)
-      fuzz_target_funcs[fuzz_target_file].append(target_func)
+      funcs.append(target_func)
+      func_keys.add(_function_key(target_func))
+
+    if funcs:
+      fuzz_target_funcs[fuzz_target_file] = funcs
 
   # Sort functions in each target file by their complexity.
   # Assume the most complex functions are the ones under test,
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for introspector.py."""
+
+import multiprocessing
+import unittest
+from multiprocessing import pool
+
+from data_prep import introspector
+
+
+def _child_gets_new_session() -> bool:
+  """Returns True if this (forked) process does not reuse the inherited
+  session."""
+  assert introspector._session is not None
+  inherited = introspector._session[1]
+  return introspector._get_session() is not inherited
+
+
+class GetSessionTest(unittest.TestCase):
+  """Tests for _get_session."""
+
+  def test_shared_by_threads(self):
+    session = introspector._get_session()
+    with pool.ThreadPool(4) as p:
+      sessions = p.map(lambda _: introspector._get_session(), range(4))
+    for thread_session in sessions:
+      self.assertIs(thread_session, session)
+
+  def test_not_shared_with_forked_child(self):
+    introspector._get_session()
+    with multiprocessing.get_context('fork').Pool(1) as p:
+      self.assertTrue(p.apply(_child_gets_new_session))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,9 +1,11 @@
 """Class to retrieve context from introspector for
 better prompt generation."""
 
+import collections
 import logging
 import os
 from difflib import SequenceMatcher
+from multiprocessing import pool
 from typing import Any
 
 from data_prep import introspector
@@ -60,7 +62,9 @@ class ContextRetriever:
     in the function declaration."""
     types = []
     files = set()
-    types.append(self._clean_type(self._benchmark.return_type))
+    return_type = self._clean_type(self._benchmark.return_type)
+    if return_type:
+      types.append(return_type)
 
     params = self._benchmark.params
 
@@ -69,7 +73,12 @@ class ContextRetriever:
       if cleaned_type:
         types.append(cleaned_type)
 
-    for current_type in types:
+    # Builtin-only signatures have nothing to query introspector for.
+    if not types:
+      return []
+
+    # Query each type once, even if several parameters share it.
+    for current_type in dict.fromkeys(types):
       info_list = introspector.query_introspector_type_info(
           self._benchmark.project, current_type)
       if not info_list:
@@ -103,7 +112,8 @@ class ContextRetriever:
 
         files.add(include_file)
 
-    return list(files)
+    # Sorted for a deterministic prompt across runs.
+    return sorted(files)
 
   def _clean_type(self, type_name: str) -> str:
     """Cleans a type so that it can be fetched from FI."""
@@ -161,17 +171,20 @@ class ContextRetriever:
 
   def get_context_info(self) -> dict:
     """Retrieves contextual information and stores them in a dictionary."""
-    xrefs = self._get_xrefs_to_function()
-    func_source = self._get_function_implementation()
-    files = self._get_files_to_include()
-    decl = self._get_embeddable_declaration()
-
-    context_info = {
-        'xrefs': xrefs,
-        'func_source': func_source,
-        'files': files,
-        'decl': decl
-    }
+    # The introspector queries behind these are independent of each other,
+    # so prefetch them concurrently instead of paying each round-trip in turn.
+    with pool.ThreadPool(3) as p:
+      xrefs = p.apply_async(self._get_xrefs_to_function)
+      func_source = p.apply_async(self._get_function_implementation)
+      files = p.apply_async(self._get_files_to_include)
+      decl = self._get_embeddable_declaration()
+
+      context_info = {
+          'xrefs': xrefs.get(),
+          'func_source': func_source.get(),
+          'files': files.get(),
+          'decl': decl
+      }
 
     logging.debug('Context: %s', context_info)
 
@@ -180,25 +193,32 @@ class ContextRetriever:
   def _concat_info_lines(self, info: dict) -> str:
     """Concatenates source code lines based on |info|."""
     include_file = self._get_source_file(info)
-    include_lines = sorted([self._get_source_line(info)] + [
-        self._get_source_line(element) for element in info.get('elements', [])
-    ])
+    include_lines = [self._get_source_line(info)]
+    include_lines.extend(
+        self._get_source_line(element) for element in info.get('elements', []))
 
+    # Only the first and last lines are needed, no need to sort all of them.
     # Add the next line after the last element.
     return introspector.query_introspector_source_code(self._benchmark.project,
                                                        include_file,
-                                                       include_lines[0],
-                                                       include_lines[-1] + 1)
+                                                       min(include_lines),
+                                                       max(include_lines) + 1)
 
   def get_type_def(self, type_name: str) -> str:
     """Retrieves the source code definitions for the given |type_name|."""
-    type_names = [self._clean_type(type_name)]
-    considered_types = []
+    cleaned_type = self._clean_type(type_name)
+    # Builtin types have no definition to look up in introspector.
+    if not cleaned_type:
+      logging.debug('No type definition to retrieve for: %s', type_name)
+      return ''
+
+    type_names = collections.deque([cleaned_type])
+    considered_types = set()
     type_def = ''
 
     while type_names:
       # Breath-first is more suitable for prompting.
-      current_type = type_names.pop(0)
+      current_type = type_names.popleft()
       info_list = introspector.query_introspector_type_info(
           self._benchmark.project, current_type)
       if not info_list:
@@ -206,9 +226,18 @@ class ContextRetriever:
                         self._benchmark.project, current_type)
         continue
 
-      for info in info_list:
-        type_def += self._concat_info_lines(info) + '\n'
-        considered_types.append(current_type)
+      # Each definition's source is a separate query, fetch them concurrently.
+      # Most types have a single definition, which needs no thread pool.
+      if len(info_list) == 1:
+        info_sources = [self._concat_info_lines(info_list[0])]
+      else:
+        num_threads = min(len(info_list), introspector.MAX_CONCURRENT_QUERIES)
+        with pool.ThreadPool(num_threads) as p:
+          info_sources = p.map(self._concat_info_lines, info_list)
+
+      for info, info_source in zip(info_list, info_sources):
+        type_def += info_source + '\n'
+        considered_types.add(current_type)
 
         # Retrieve nested unseen types.
         new_type_type = info.get('type')
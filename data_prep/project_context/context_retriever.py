@@ -188,7 +188,6 @@ class ContextRetriever:
     for token in tokens:
       item = token.replace('*', '')
       re.sub(r'\[[0-9]*\]', '', item)
-      re.sub(r'\(\*\)', '', item)
       tmp.append(item)
 
     tokens = tmp
@@ -270,6 +269,12 @@ class ContextRetriever:
   def generate_lookups(self):
     """Goes through all AST files downloaded.
     Generates a lookup so that RecordDecl/TypedefDecl/EnumDecl nodes can be found by name."""
+    lookups = {
+        'TypedefDecl': self._typedef_decl_nodes,
+        'RecordDecl': self._record_decl_nodes,
+        'EnumDecl': self._enum_decl_nodes,
+    }
+
     for ast_file_path in os.listdir(self._ast_path):
       with open(f'{self._ast_path}/{ast_file_path}') as ast_file:
         try:
@@ -280,21 +285,14 @@ class ContextRetriever:
           continue
 
       ast_nodes = ast_json.get('inner', [])
-      relevant_kinds = ['TypedefDecl', 'RecordDecl', 'EnumDecl']
 
       for ast_node in ast_nodes:
-        ast_kind = ast_node.get('kind')
-        node_name = ast_node.get('name')
-
-        if ast_kind not in relevant_kinds:
+        # A single lookup both filters irrelevant kinds and picks the table.
+        lookup = lookups.get(ast_node.get('kind'))
+        if lookup is None:
           continue
 
-        if ast_kind == 'TypedefDecl':
-          self._typedef_decl_nodes[node_name].append(ast_node)
-        elif ast_kind == 'RecordDecl':
-          self._record_decl_nodes[node_name].append(ast_node)
-        elif ast_kind == 'EnumDecl':
-          self._enum_decl_nodes[node_name].append(ast_node)
+        lookup[ast_node.get('name')].append(ast_node)
 
   def get_header(self) -> str:
     """Goes through all AST files looking for a file where a FunctionDecl exists for the target function."""
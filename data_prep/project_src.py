@@ -301,15 +301,18 @@ def _identify_fuzz_targets(out: str, interesting_filenames: list[str],
   interesting_filepaths = []
   potential_harnesses = []
 
-  for root, _, filenames in os.walk(out):
-    is_bad = False
-    for ignore_dir in SEARCH_IGNORE_DIRS:
-      # Exclude engine source.
-      if f'out/src/{ignore_dir}' in root:
-        is_bad = True
-        break
-    if is_bad:
+  ignore_paths = [f'out/src/{ignore_dir}' for ignore_dir in SEARCH_IGNORE_DIRS]
+  for root, dirnames, filenames in os.walk(out):
+    # Exclude engine source. Prune it from the walk instead of listing every
+    # file underneath only to discard them.
+    if any(ignore_path in root for ignore_path in ignore_paths):
+      dirnames.clear()
       continue
+    dirnames[:] = [
+        dirname for dirname in dirnames
+        if not any(ignore_path in os.path.join(root, dirname)
+                   for ignore_path in ignore_paths)
+    ]
     for filename in filenames:
       if not benchmark.get_file_type(filename):
         continue
@@ -376,8 +379,10 @@ def _copy_fuzz_targets(harness_path: str, dest_dir: str, project: str):
     raise Exception(f'Failed to copy harness from {harness_path} to {dest_dir}',
                     harness_path, dest_dir)
 
-  logging.info('Retrieved fuzz targets from %s:\n  %s', project,
-               '\n  '.join(os.listdir(dest_dir)))
+  # Only list the directory when the message will actually be emitted.
+  if logging.getLogger().isEnabledFor(logging.INFO):
+    logging.info('Retrieved fuzz targets from %s:\n  %s', project,
+                 '\n  '.join(os.listdir(dest_dir)))
 
 
 def search_source(
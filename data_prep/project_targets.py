@@ -18,6 +18,7 @@ for training.
 """
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -34,6 +35,10 @@ OSS_FUZZ_EXP_BUCKET = 'oss-fuzz-llm-public'
 # TODO(dongge): Use tmp dir.
 OSS_FUZZ_PATH = os.path.join(os.path.dirname(__file__), '..', 'oss-fuzz')
 
+MULTI_LINE_COMMENT_REGEX = re.compile(r'/\*.*?\*/', re.DOTALL)
+SINGLE_LINE_COMMENT_REGEX = re.compile(r'(?:^|\s+)//.*\n')
+EMPTY_LINE_REGEX = re.compile(r'\n+\s*\n+')
+
 
 def _get_fuzz_target_dir(project_name: str) -> str:
   """Returns the directory that contains the fuzz targets of |project_name|.
@@ -169,16 +174,13 @@ def generate_data(project_name: str,
 def _remove_header_comments(code: str) -> str:
   """Removes comments and empty lines in the code."""
   # Remove multi-line comments.
-  multi_line_comment = re.compile(r'/\*.*?\*/', re.DOTALL)
-  code = re.sub(multi_line_comment, '', code)
+  code = MULTI_LINE_COMMENT_REGEX.sub('', code)
 
   # Remove single-line comments.
-  single_line_comment = re.compile(r'(?:^|\s+)//.*\n')
-  code = re.sub(single_line_comment, '\n', code)
+  code = SINGLE_LINE_COMMENT_REGEX.sub('\n', code)
 
   # Remove empty lines.
-  empty_line = re.compile(r'\n+\s*\n+')
-  code = re.sub(empty_line, '\n', code)
+  code = EMPTY_LINE_REGEX.sub('\n', code)
 
   # Trim all newlines and spaces.
   code.lstrip('\n ')
@@ -196,6 +198,8 @@ def _remove_header(code: str) -> str:
   return _remove_header_comments(header) + content
 
 
+# The same example targets are filtered again for every prompt built.
+@functools.lru_cache(maxsize=128)
 def filter_target_lines(target_content: str) -> str:
   """Remove non-interesting lines in the target_content."""
   target_content = _remove_header(target_content)
@@ -23,6 +23,20 @@ from typing import List, Optional
 
 import yaml
 
+# str.endswith() takes a tuple and checks all suffixes in one call.
+CPP_EXTENSIONS = ('.cc', '.cpp', '.cxx', '.c++', '.h', '.hpp')
+
+# Removes or replaces special characters of JVM signatures in benchmark ids.
+JVM_ID_TRANSLATION = str.maketrans({
+    '<': None,
+    '>': None,
+    '[': None,
+    ']': None,
+    '(': '_',
+    ')': None,
+    ',': '_',
+})
+
 
 class FileType(Enum):
   """File types of target files."""
@@ -149,9 +163,7 @@ class Benchmark:
       # constructors which will be shown as <init> because constructors do not
       # have names.
       self.function_signature = self.function_name
-      self.id = self.id.replace('<', '').replace('>', '')
-      self.id = self.id.replace('[', '').replace(']', '')
-      self.id = self.id.replace('(', '_').replace(')', '').replace(',', '_')
+      self.id = self.id.translate(JVM_ID_TRANSLATION)
 
   def __str__(self):
     return (f'Benchmark<id={self.id}, project={self.project}, '
@@ -186,8 +198,7 @@ def get_file_type(file_path: str) -> FileType:
   """Returns the file type based on the extension of |file_name|."""
   if file_path.endswith('.c'):
     return FileType.C
-  cpp_extensions = ['.cc', '.cpp', '.cxx', '.c++', '.h', '.hpp']
-  if any(file_path.endswith(ext) for ext in cpp_extensions):
+  if file_path.endswith(CPP_EXTENSIONS):
     return FileType.CPP
   if file_path.endswith('.java'):
     return FileType.JAVA
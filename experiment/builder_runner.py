@@ -15,6 +15,7 @@
 Project local/cloud builder and runner.
 """
 import dataclasses
+import functools
 import json
 import logging
 import os
@@ -43,11 +44,27 @@ JCC_DIR = '/usr/local/bin'
 
 RUN_TIMEOUT: int = 30
 CLOUD_EXP_MAX_ATTEMPT = 5
-
-LIBFUZZER_MODULES_LOADED_REGEX = re.compile(
-    r'^INFO:\s+Loaded\s+\d+\s+(modules|PC tables)\s+\((\d+)\s+.*\).*')
-LIBFUZZER_COV_REGEX = re.compile(r'.*cov: (\d+) ft:')
-LIBFUZZER_CRASH_TYPE_REGEX = re.compile(r'.*Test unit written to.*')
+# List of (error_str, exp_backoff_func) of cloud experiment errors to retry.
+CLOUD_RETRYABLE_ERRORS = [
+    # As mentioned in pr #100.
+    ('RESOURCE_EXHAUSTED', lambda x: 5 * 2**x + random.randint(50, 90)),
+    # As mentioned in pr #151.
+    ('BrokenPipeError: [Errno 32] Broken pipe',
+     lambda x: 5 * 2**x + random.randint(1, 5)),
+    # Temp workaround for issue #12.
+    ('You do not currently have an active account selected',
+     lambda x: 5 * 2**x),
+    # Workaround for issue #85.
+    ('gcloud crashed (OSError): unexpected end of data', lambda x: 5 * 2**x),
+]
+
+# Matches module-loaded, coverage and crash lines in one pass; only the group
+# of the first matching alternative is set.
+LIBFUZZER_LOG_LINE_REGEX = re.compile(
+    r'INFO:\s+Loaded\s+\d+\s+(?:modules|PC tables)\s+'
+    r'\((?P<total_pcs>\d+)\s+.*\)'
+    r'|.*cov: (?P<cov_pcs>\d+) ft:'
+    r'|.*Test unit written to')
 LIBFUZZER_COV_LINE_PREFIX = re.compile(r'^#(\d+)')
 LIBFUZZER_STACK_FRAME_LINE_PREFIX = re.compile(r'^\s+#\d+')
 CRASH_EXCLUSIONS = re.compile(r'.*(slow-unit-|timeout-|leak-|oom-).*')
@@ -106,6 +123,9 @@ class BuilderRunner:
   FUNC_NAME = re.compile(r'(?:^|\s|\b)([\w:]+::)*(\w+)(?:<[^>]*>)?(?=\(|$)')
   # Regex for extract line number,
   LINE_NUMBER = re.compile(r':(\d+):')
+  # Regex for extract the minimum function name from a function signature.
+  MIN_FUNC_NAME = re.compile(
+      r'(?:[a-zA-Z_]\w*::)*([a-zA-Z_]\w*|operator[^(\s]*)(?:\s*<.*>)?\s*\(')
 
   def __init__(self,
                benchmark: Benchmark,
@@ -131,9 +151,7 @@ class BuilderRunner:
   def _get_minimum_func_name(self, func_sig: str) -> str:
     """Extracts the minimum function name from function signature,
     without name space, return type, params, templates."""
-    pattern = (r'(?:[a-zA-Z_]\w*::)*([a-zA-Z_]\w*|operator[^(\s]*)(?:\s*<.*>)?'
-               r'\s*\(')
-    match = re.search(pattern, func_sig)
+    match = self.MIN_FUNC_NAME.search(func_sig)
     if not match:
       return func_sig
 
@@ -173,11 +191,16 @@ class BuilderRunner:
     with open(target_path) as generated_code_file:
       generated_code = generated_code_file.read()
 
+    return self._target_function_pattern.search(generated_code) is not None
+
+  @functools.cached_property
+  def _target_function_pattern(self) -> re.Pattern:
+    """The pattern of the target function, shared by all pre-build checks."""
+    # The benchmark is fixed for this runner, so the pattern is derived once
+    # rather than for every target and every fixing iteration.
     min_func_name = self._get_minimum_func_name(
         self.benchmark.function_signature)
-
-    pattern = rf'\b{min_func_name}\b'
-    return re.search(pattern, generated_code) is not None
+    return re.compile(rf'\b{min_func_name}\b')
 
   def _pre_build_check(self, target_path: str,
                        build_result: BuildResult) -> bool:
@@ -273,24 +296,42 @@ class BuilderRunner:
 
     return func_info
 
+  @staticmethod
+  def _parse_cov_from_libfuzzer_line(line: str) -> int:
+    """Parses the cov value of a libFuzzer status line containing 'cov: '."""
+    # Slices between the markers, rather than splitting the line twice.
+    start = line.find('cov: ') + len('cov: ')
+    end = line.find(' ft:', start)
+    return int(line[start:end] if end != -1 else line[start:])
+
   def _parse_fuzz_cov_info_from_libfuzzer_logs(
       self,
       lines: list[str]) -> tuple[Optional[int], Optional[int], Optional[int]]:
     """Parses cov of INITED & DONE, and round number from libFuzzer logs."""
     initcov, donecov, lastround = None, None, None
 
-    for line in lines:
-      if line.startswith('#'):
-        # Parses cov line to get the round number.
-        match = LIBFUZZER_COV_LINE_PREFIX.match(line)
-        roundno = int(match.group(1)) if match else None
-
-        if roundno is not None:
-          lastround = roundno
-          if 'INITED' in line and 'cov: ' in line:
-            initcov = int(line.split('cov: ')[1].split(' ft:')[0])
-          elif 'DONE' in line and 'cov: ' in line:
-            donecov = int(line.split('cov: ')[1].split(' ft:')[0])
+    # Keeps the last INITED, DONE and round values, like a forward scan would,
+    # so scan backwards and stop once all of them are found. This still
+    # handles merged or restarted logs with several INITED or DONE lines.
+    for line in reversed(lines):
+      if not line.startswith('#'):
+        continue
+      # Parses cov line to get the round number.
+      match = LIBFUZZER_COV_LINE_PREFIX.match(line)
+      if not match:
+        continue
+
+      if lastround is None:
+        lastround = int(match.group(1))
+      if 'INITED' in line and 'cov: ' in line:
+        if initcov is None:
+          initcov = self._parse_cov_from_libfuzzer_line(line)
+      elif 'DONE' in line and 'cov: ' in line:
+        if donecov is None:
+          donecov = self._parse_cov_from_libfuzzer_line(line)
+
+      if initcov is not None and donecov is not None:
+        break
 
     return initcov, donecov, lastround
 
@@ -320,21 +361,17 @@ class BuilderRunner:
     cov_pcs, total_pcs, crashes = 0, 0, False
 
     for line in lines:
-      m = LIBFUZZER_MODULES_LOADED_REGEX.match(line)
-      if m:
-        total_pcs = int(m.group(2))
-        continue
-
-      m = LIBFUZZER_COV_REGEX.match(line)
-      if m:
-        cov_pcs = int(m.group(1))
+      m = LIBFUZZER_LOG_LINE_REGEX.match(line)
+      if not m:
         continue
 
-      m = LIBFUZZER_CRASH_TYPE_REGEX.match(line)
-      if m and not CRASH_EXCLUSIONS.match(line):
+      if m.group('total_pcs'):
+        total_pcs = int(m.group('total_pcs'))
+      elif m.group('cov_pcs'):
+        cov_pcs = int(m.group('cov_pcs'))
+      elif not CRASH_EXCLUSIONS.match(line):
         # TODO(@happy-qop): Handling oom, slow cases in semantic checks & fix.
         crashes = True
-        continue
 
     initcov, donecov, lastround = self._parse_fuzz_cov_info_from_libfuzzer_logs(
         lines)
@@ -710,24 +747,14 @@ class CloudBuilderRunner(BuilderRunner):
     self.experiment_bucket = experiment_bucket
     super().__init__(*args, **kwargs)
 
+  @functools.cached_property
+  def _storage_client(self) -> storage.Client:
+    """A client shared across targets, created when first needed."""
+    return storage.Client()
+
   @staticmethod
   def _run_with_retry_control(target_path: str, *args, **kwargs) -> bool:
     """sp.run() with controllable retry and customized exponential backoff."""
-    # List of (error_str, exp_backoff_func).
-    retryable_errors = [
-        # As mentioned in pr #100.
-        ('RESOURCE_EXHAUSTED', lambda x: 5 * 2**x + random.randint(50, 90)),
-        # As mentioned in pr #151.
-        ('BrokenPipeError: [Errno 32] Broken pipe',
-         lambda x: 5 * 2**x + random.randint(1, 5)),
-        # Temp workaround for issue #12.
-        ('You do not currently have an active account selected',
-         lambda x: 5 * 2**x),
-        # Workaround for issue #85.
-        ('gcloud crashed (OSError): unexpected end of data', lambda x: 5 * 2**x
-        ),
-    ]
-
     for attempt_id in range(1, CLOUD_EXP_MAX_ATTEMPT + 1):
       try:
         sp.run(*args, capture_output=True, check=True, **kwargs)
@@ -737,9 +764,10 @@ class CloudBuilderRunner(BuilderRunner):
         stdout = e.stdout.decode('utf-8').replace('\n', '\t')
         stderr = e.stderr.decode('utf-8').replace('\n', '\t')
 
+        output = stdout + stderr
         delay = next((delay_f(attempt_id)
-                      for err, delay_f in retryable_errors
-                      if err in stdout + stderr), 0)
+                      for err, delay_f in CLOUD_RETRYABLE_ERRORS
+                      if err in output), 0)
 
         if not delay or attempt_id == CLOUD_EXP_MAX_ATTEMPT:
           logging.error('Failed to evaluate %s on cloud, attempt %d:\n%s\n%s',
@@ -822,8 +850,7 @@ class CloudBuilderRunner(BuilderRunner):
 
     logging.info('Evaluated %s on cloud.', os.path.realpath(target_path))
 
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(self.experiment_bucket)
+    bucket = self._storage_client.bucket(self.experiment_bucket)
 
     build_result.log_path = build_log_path
 
@@ -19,6 +19,8 @@ import json
 import os
 import re
 import shutil
+import threading
+from multiprocessing import pool
 from typing import Optional
 
 from google.cloud import storage
@@ -138,7 +140,7 @@ def _compute_total_lines_without_fuzz_targets(
 
 def _rectify_docker_tag(docker_tag: str) -> str:
   # Replace "::" and any character not \w, _, or . with "-".
-  valid_docker_tag = re.sub(r'::', '-', docker_tag)
+  valid_docker_tag = docker_tag.replace('::', '-')
   valid_docker_tag = re.sub(r'[^\w_.]', '-', valid_docker_tag)
   # Docker fails with tags containing -_ or _-.
   valid_docker_tag = re.sub(r'[-_]{2,}', '-', valid_docker_tag)
@@ -163,8 +165,11 @@ class _Logger:
 
   def return_result(self, result: Result):
     with open(self._result_path, 'w') as f:
-      json.dump(result.dict(), f)
+      f.write(json.dumps(result.dict()))
 
+    # The result is the last thing logged for a sample, release the handle so
+    # long experiments do not accumulate one open file per sample.
+    self._log.close()
     return result
 
 
@@ -176,6 +181,11 @@ class Evaluator:
     self.builder_runner = runner
     self.benchmark = benchmark
     self.work_dirs = work_dirs
+    # The project's existing coverage is the same for every target evaluated
+    # in parallel, so download and parse it only once.
+    self._existing_coverage_lock = threading.Lock()
+    self._existing_coverage_summary: Optional[dict] = None
+    self._existing_textcov: Optional[textcov.Textcov] = None
 
   def build_log_path(self, generated_target_name: str, iteration: int):
     return os.path.join(self.work_dirs.run_logs,
@@ -333,13 +343,20 @@ class Evaluator:
     # Triage the crash with LLM
     logger.log(f'Triaging the crash related to {target_path} with '
                f'{self.builder_runner.fixer_model_name}.')
-    run_result.triage = self.triage_crash(
-        ai_binary,
-        generated_oss_fuzz_project,
-        target_path,
-        run_result,
-        logger,
-    )
+    triage_args = (ai_binary, generated_oss_fuzz_project, target_path,
+                   run_result, logger)
+    if (run_result.crash_info and run_result.succeeded and
+        run_result.coverage_summary is not None and
+        run_result.coverage is not None):
+      # The existing coverage needed for the coverage diff below does not
+      # depend on the triage result, download it while the LLM is queried.
+      with pool.ThreadPool(1) as p:
+        prefetch = p.apply_async(self._prefetch_existing_coverage)
+        run_result.triage = self.triage_crash(*triage_args)
+        prefetch.wait()
+    else:
+      # Without a crash the triage returns immediately, nothing to overlap.
+      run_result.triage = self.triage_crash(*triage_args)
 
     if run_result.coverage_summary is None or run_result.coverage is None:
       logger.log(
@@ -403,11 +420,24 @@ class Evaluator:
                not run_result.succeeded, run_result.semantic_check.type,
                run_result.triage))
 
+  def _prefetch_existing_coverage(self) -> None:
+    """Populates the existing coverage caches."""
+    self._load_existing_coverage_summary()
+    self._load_existing_textcov()
+
   def _load_existing_coverage_summary(self) -> dict:
     """Load existing summary.json."""
-    return load_existing_coverage_summary(self.benchmark.project)
+    with self._existing_coverage_lock:
+      if self._existing_coverage_summary is None:
+        self._existing_coverage_summary = load_existing_coverage_summary(
+            self.benchmark.project)
+      return self._existing_coverage_summary
 
   def _load_existing_textcov(self) -> textcov.Textcov:
     """Loads existing textcovs."""
-    return load_existing_textcov(self.benchmark.project,
-                                 self.benchmark.language)
+    # Only read by subtract_covered_lines(), so sharing it is safe.
+    with self._existing_coverage_lock:
+      if self._existing_textcov is None:
+        self._existing_textcov = load_existing_textcov(self.benchmark.project,
+                                                       self.benchmark.language)
+      return self._existing_textcov
@@ -47,11 +47,58 @@ class SemanticCheckResult:
   # E.g., matches 'SCARINESS: 10 (null-deref)'
   SYMPTOM_SCARINESS = re.compile(r'SCARINESS:\s*\d+\s*\((.*)\)\n')
 
-  # Regex for extract crash information.
-  INFO_CRASH = re.compile(r'ERROR: (.*?)(?=SUMMARY)', re.DOTALL)
+  # Markers delimiting crash information.
+  INFO_CRASH_START = 'ERROR: '
+  INFO_CRASH_END = 'SUMMARY'
 
   NO_COV_INCREASE_MSG_PREFIX = 'No code coverage increasement'
 
+  # One sentence error descriptions used in fix prompt, looked up by error type
+  # instead of testing each type in turn. |crash_symptom| is filled in.
+  ERROR_DESCS = {
+      # TODO(happy-qop): Add detailed description for this error type.
+      LOG_MESS_UP:
+          'Overlong fuzzing log.',
+      FP_NEAR_INIT_CRASH:
+          ('Fuzzing crashed immediately at runtime ({crash_symptom}), '
+           'indicating fuzz target code for invoking the function under test '
+           'is incorrect or unrobust.'),
+      FP_TARGET_CRASH:
+          ('Fuzzing has crashes ({crash_symptom}) caused by fuzz target code, '
+           'indicating its usage for the function under test is incorrect or '
+           'unrobust.'),
+      FP_MEMLEAK:
+          ('Memory leak detected, indicating some memory was not freed by the '
+           'fuzz target.'),
+      FP_OOM:
+          ('Out-of-memory error detected, suggesting the fuzz target '
+           'incorrectly allocates too much memory or has a memory leak.'),
+      FP_TIMEOUT:
+          ('Fuzz target timed out at runtime, indicating its usage for the '
+           'function under test is incorrect or unrobust.'),
+      # TODO(dongge): Append the implementation of the function under test.
+      NO_COV_INCREASE:
+          (NO_COV_INCREASE_MSG_PREFIX + ', indicating the fuzz target '
+           'ineffectively invokes the function under test.'),
+      NULL_DEREF:
+          ('Accessing a null pointer, indicating improper parameter '
+           'initialization or incorrect function usages in the fuzz target.'),
+      SIGNAL:
+          ('Abort with signal, indicating the fuzz target has violated some '
+           'assertion in the project, likely due to improper parameter '
+           'initialization or incorrect function usages.'),
+      EXIT:
+          ('Fuzz target exited in a controlled manner without showing any '
+           'sign of memory corruption, likely due to the fuzz target is not '
+           'well designed to effectively find memory corruption '
+           'vulnerability in the function-under-test.'),
+      OVERWRITE_CONST:
+          ('Fuzz target modified a const data. To fix this, ensure that all '
+           'input data passed to the fuzz target is treated as read-only '
+           'and not modified. Copy the input data to a separate buffer if '
+           'any modifications are necessary.'),
+  }
+
   @classmethod
   def extract_symptom(cls, fuzzlog: str) -> str:
     """Extracts crash symptom from fuzzing logs."""
@@ -78,9 +125,14 @@ class SemanticCheckResult:
   @classmethod
   def extract_crash_info(cls, fuzzlog: str) -> str:
     """Extracts crash information from fuzzing logs."""
-    match = cls.INFO_CRASH.search(fuzzlog)
-    if match:
-      return match.group(1)
+    # Plain substring search: a lazy DOTALL regex retries from every
+    # 'ERROR: ' to the end of large logs without a SUMMARY.
+    start = fuzzlog.find(cls.INFO_CRASH_START)
+    if start != -1:
+      start += len(cls.INFO_CRASH_START)
+      end = fuzzlog.find(cls.INFO_CRASH_END, start)
+      if end != -1:
+        return fuzzlog[start:end]
 
     logging.warning('Failed to match crash information.')
     return ''
@@ -97,49 +149,8 @@ class SemanticCheckResult:
 
   def _get_error_desc(self) -> str:
     """Returns one sentence error description used in fix prompt."""
-    if self.type == self.LOG_MESS_UP:
-      # TODO(happy-qop): Add detailed description for this error type.
-      return 'Overlong fuzzing log.'
-    if self.type == self.FP_NEAR_INIT_CRASH:
-      return (f'Fuzzing crashed immediately at runtime ({self.crash_symptom})'
-              ', indicating fuzz target code for invoking the function under'
-              ' test is incorrect or unrobust.')
-    if self.type == self.FP_TARGET_CRASH:
-      return (f'Fuzzing has crashes ({self.crash_symptom}) caused by fuzz '
-              'target code, indicating its usage for the function under '
-              'test is incorrect or unrobust.')
-    if self.type == self.FP_MEMLEAK:
-      return ('Memory leak detected, indicating some memory was not freed '
-              'by the fuzz target.')
-    if self.type == self.FP_OOM:
-      return ('Out-of-memory error detected, suggesting the fuzz target '
-              'incorrectly allocates too much memory or has a memory leak.')
-    if self.type == self.FP_TIMEOUT:
-      return ('Fuzz target timed out at runtime, indicating its usage for '
-              'the function under test is incorrect or unrobust.')
-    if self.type == self.NO_COV_INCREASE:
-      # TODO(dongge): Append the implementation of the function under test.
-      return (self.NO_COV_INCREASE_MSG_PREFIX + ', indicating the fuzz target'
-              ' ineffectively invokes the function under test.')
-    if self.type == self.NULL_DEREF:
-      return ('Accessing a null pointer, indicating improper parameter '
-              'initialization or incorrect function usages in the fuzz target.')
-    if self.type == self.SIGNAL:
-      return ('Abort with signal, indicating the fuzz target has violated some '
-              'assertion in the project, likely due to improper parameter '
-              'initialization or incorrect function usages.')
-    if self.type == self.EXIT:
-      return ('Fuzz target exited in a controlled manner without showing any '
-              'sign of memory corruption, likely due to the fuzz target is not '
-              'well designed to effectively find memory corruption '
-              'vulnerability in the function-under-test.')
-    if self.type == self.OVERWRITE_CONST:
-      return ('Fuzz target modified a const data. To fix this, ensure that all '
-              'input data passed to the fuzz target is treated as read-only '
-              'and not modified. Copy the input data to a separate buffer if '
-              'any modifications are necessary.')
-
-    return ''
+    return self.ERROR_DESCS.get(self.type,
+                                '').format(crash_symptom=self.crash_symptom)
 
   def _get_error_detail(self) -> list[str]:
     """Returns detailed error description used in fix prompt."""
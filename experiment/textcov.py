@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import logging
 import re
 import subprocess
@@ -24,9 +25,24 @@ from typing import BinaryIO, List, Optional
 
 import chardet
 
-# No spaces at the beginning, and ends with a ":".
-FUNCTION_PATTERN = re.compile(r'^([^\s].*):$')
-LINE_PATTERN = re.compile(r'^\s*\d+\|\s*([\d\.a-zA-Z]+)\|(.*)')
+# Matches either a function line (no spaces at the beginning, and ends with a
+# ":"), or a covered source line, so each covreport line is scanned only once.
+COVREPORT_LINE_PATTERN = re.compile(
+    r'^(?:(?P<function>[^\s].*):$|'
+    r'\s*\d+\|\s*(?P<hit_count>[\d\.a-zA-Z]+)\|(?P<contents>.*))')
+TEMPLATE_ARGS_PATTERN = re.compile(r'<.*>')
+
+# From https://github.com/llvm/llvm-project/blob/3f3620e5c9ee0f7b64afc39e5a26c6f4cc5e7b37/llvm/tools/llvm-cov/SourceCoverageView.cpp#L102
+HITCOUNT_MULTIPLIERS = {
+    'k': 1000,
+    'M': 1000000,
+    'G': 1000000000,
+    'T': 1000000000000,
+    'P': 1000000000000000,
+    'E': 1000000000000000000,
+    'Z': 1000000000000000000000,
+    'Y': 1000000000000000000000000,
+}
 
 JVM_CLASS_MAPPING = {
     'Z': 'boolean',
@@ -43,6 +59,8 @@ JVM_SKIPPED_METHOD = [
     '<init>', '<cinit>', 'fuzzerTestOneInput', 'fuzzerInitialize',
     'fuzzerTearDown'
 ]
+# Fuzzing and testing classes, matched without lowercasing each class name.
+JVM_SKIPPED_CLASS_PATTERN = re.compile(r'test|fuzzer', re.IGNORECASE)
 
 
 def demangle(data: str) -> str:
@@ -64,32 +82,24 @@ def _discard_fuzz_target_lines(covreport_content: str) -> str:
   return '\n\n'.join(project_file_contents)
 
 
+# Function names and hitcounts repeat across the many coverage reports parsed
+# in an experiment, so cache these pure string conversions.
+@functools.lru_cache(maxsize=4096)
 def normalize_template_args(name: str) -> str:
   """Normalizes template arguments."""
-  return re.sub(r'<.*>', '<>', name)
+  return TEMPLATE_ARGS_PATTERN.sub('<>', name)
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_hitcount(data: str) -> float:
   """Parse a hitcount."""
-  # From https://github.com/llvm/llvm-project/blob/3f3620e5c9ee0f7b64afc39e5a26c6f4cc5e7b37/llvm/tools/llvm-cov/SourceCoverageView.cpp#L102
-  multipliers = {
-      'k': 1000,
-      'M': 1000000,
-      'G': 1000000000,
-      'T': 1000000000000,
-      'P': 1000000000000000,
-      'E': 1000000000000000000,
-      'Z': 1000000000000000000000,
-      'Y': 1000000000000000000000000,
-  }
-
   if data[-1].isdigit():
     # Simple number < 1000.
     return int(data)
 
-  if data[-1] in multipliers:
+  if data[-1] in HITCOUNT_MULTIPLIERS:
     # E.g. "11.4k"
-    return float(data[:-1]) * multipliers[data[-1]]
+    return float(data[:-1]) * HITCOUNT_MULTIPLIERS[data[-1]]
 
   raise ValueError(f'Suffix {data[-1]} is not supported')
 
@@ -111,8 +121,10 @@ class Function:
 
   def merge(self, other: Function):
     for line in other.lines.values():
-      if line.contents in self.lines:
-        self.lines[line.contents].hit_count += line.hit_count
+      # Update the existing line in place, looking it up only once.
+      merged_line = self.lines.get(line.contents)
+      if merged_line is not None:
+        merged_line.hit_count += line.hit_count
       else:
         self.lines[line.contents] = Line(contents=line.contents,
                                          hit_count=line.hit_count)
@@ -138,8 +150,8 @@ class Function:
       # For our analysis purposes, we completely delete any lines that are
       # hit by the other, rather than subtracting hitcounts.
       for line in other.lines.values():
-        if line.hit_count and line.contents in self.lines:
-          del self.lines[line.contents]
+        if line.hit_count:
+          self.lines.pop(line.contents, None)
 
 
 @dataclasses.dataclass
@@ -195,10 +207,14 @@ class Textcov:
     demangled = _discard_fuzz_target_lines(demangled)
 
     for line in demangled.split('\n'):
-      match = FUNCTION_PATTERN.match(line)
-      if match:
+      match = COVREPORT_LINE_PATTERN.match(line)
+      if not match:
+        continue
+
+      if match.group('function') is not None:
         # Normalize templates.
-        current_function_name = normalize_template_args(match.group(1))
+        current_function_name = normalize_template_args(
+            match.group('function'))
         if any(
             p.match(current_function_name) for p in ignore_function_patterns):
           # Ignore this function.
@@ -218,19 +234,15 @@ class Textcov:
         # ignored function.
         continue
 
-      match = LINE_PATTERN.match(line)
-      if match:
-        hit_count = _parse_hitcount(match.group(1))
-        # Ignore whitespace differences
-        line_contents = match.group(2).strip()
+      hit_count = _parse_hitcount(match.group('hit_count'))
+      # Ignore whitespace differences
+      line_contents = match.group('contents').strip()
 
-        if line_contents in current_function.lines:
-          current_function.lines[line_contents].hit_count += hit_count
-        else:
-          current_function.lines[line_contents] = Line(contents=line_contents,
-                                                       hit_count=hit_count)
-
-        continue
+      if line_contents in current_function.lines:
+        current_function.lines[line_contents].hit_count += hit_count
+      else:
+        current_function.lines[line_contents] = Line(contents=line_contents,
+                                                     hit_count=hit_count)
     return textcov
 
   @classmethod
@@ -243,13 +255,13 @@ class Textcov:
     class_method_items = []
     for item in jacoco_report.iter():
       if item.tag == 'class':
-        # Skip fuzzer classes
-        if textcov.is_fuzzer_class(item):
-          continue
-
         # Get class name and skip fuzzing and testing classes
         class_name = item.attrib['name'].replace('/', '.')
-        if 'test' in class_name.lower() or 'fuzzer' in class_name.lower():
+        if JVM_SKIPPED_CLASS_PATTERN.search(class_name):
+          continue
+
+        # Skip fuzzer classes
+        if textcov.is_fuzzer_class(item):
           continue
 
         for method_item in item:
@@ -289,10 +301,10 @@ class Textcov:
 
   def to_file(self, filename: str) -> None:
     """Writes covered functions and lines to |filename|."""
-    file_content = ''
-    for func_obj in self.functions.values():
-      for line_content, line_obj in func_obj.lines.items():
-        file_content += f'{line_content}\n' if line_obj.hit_count else ''
+    file_content = ''.join(f'{line_content}\n'
+                           for func_obj in self.functions.values()
+                           for line_content, line_obj in func_obj.lines.items()
+                           if line_obj.hit_count)
 
     with open(filename, 'w') as file:
       file.write(file_content)
@@ -300,16 +312,18 @@ class Textcov:
   def merge(self, other: Textcov):
     """Merge another textcov"""
     for function in other.functions.values():
-      if function.name not in self.functions:
-        self.functions[function.name] = Function(name=function.name)
-      self.functions[function.name].merge(function)
+      merged_function = self.functions.get(function.name)
+      if merged_function is None:
+        merged_function = Function(name=function.name)
+        self.functions[function.name] = merged_function
+      merged_function.merge(function)
 
   def subtract_covered_lines(self, other: Textcov):
     """Diff another textcov"""
     for function in other.functions.values():
-      if function.name in self.functions:
-        self.functions[function.name].subtract_covered_lines(
-            function, self.language)
+      own_function = self.functions.get(function.name)
+      if own_function is not None:
+        own_function.subtract_covered_lines(function, self.language)
 
   @property
   def covered_lines(self):
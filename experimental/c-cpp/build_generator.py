@@ -15,6 +15,7 @@
 """Utilities for generating builder scripts for a GitHub repository."""
 
 import os
+import re
 import shutil
 import subprocess
 from abc import abstractmethod
@@ -22,6 +23,9 @@ from typing import Any, Dict, Iterator, List, Tuple
 
 import manager
 
+# Name following the first `option(` of each line in a CMake file.
+CMAKE_OPTION_REGEX = re.compile(r'^.*?option\(([^ \n]*)', re.MULTILINE)
+
 
 ############################################################
 #### Logic for auto building a given source code folder ####
@@ -477,10 +481,8 @@ class CMakeScanner(AutoBuildBase):
 
           with open(fi, 'r') as f:
             content = f.read()
-          for line in content.split('\n'):
-            if 'option(' in line:
-              option = line.split('option(')[1].split(' ')[0]
-              self.cmake_options.add(option)
+          for match in CMAKE_OPTION_REGEX.finditer(content):
+            self.cmake_options.add(match.group(1))
 
     if len(self.cmake_options) > 0:
       print('Options:')
@@ -651,11 +653,12 @@ def get_all_binary_files_from_folder(path: str) -> Dict[str, List[str]]:
 
   executable_files = {'static-libs': [], 'dynamic-libs': [], 'object-files': []}
   for fil in all_files:
+    # The suffixes are mutually exclusive, stop at the first match.
     if fil.endswith('.o'):
       executable_files['object-files'].append(fil)
-    if fil.endswith('.a'):
+    elif fil.endswith('.a'):
       executable_files['static-libs'].append(fil)
-    if fil.endswith('.so'):
+    elif fil.endswith('.so'):
       executable_files['dynamic-libs'].append(fil)
   return executable_files
 
@@ -730,9 +733,10 @@ def raw_build_evaluation(
         'object-files': []
     }
     for key, bfiles in binary_files_build.items():
-      for bfile in bfiles:
-        if bfile not in initial_executable_files[key]:
-          new_binary_files[key].append(bfile)
+      # Set lookups keep this linear in the number of artifacts.
+      initial_bfiles = set(initial_executable_files[key])
+      new_binary_files[key].extend(
+          bfile for bfile in bfiles if bfile not in initial_bfiles)
 
     print(f'Static libs found {new_binary_files}')
     # binary_files_build['static-libs'])
@@ -15,25 +15,35 @@
 """Auto OSS-Fuzz generator from inside OSS-Fuzz containers."""
 
 import argparse
+import functools
 import json
 import os
 import shutil
 import subprocess
 from abc import abstractmethod
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 import build_generator
 import cxxfilt
-import openai
 import templates
 import yaml
 
+if TYPE_CHECKING:
+  import openai
+
 MAX_FUZZ_PER_HEURISTIC = 15
 INTROSPECTOR_OSS_FUZZ_DIR = '/src/inspector'
 
 INTROSPECTOR_ALL_FUNCTIONS_FILE = 'all-fuzz-introspector-functions.json'
 
 LLM_MODEL = ''
+# Created on first use and reused so the HTTP connection pool persists.
+OPENAI_CLIENT: Optional['openai.OpenAI'] = None
+
+# Functions and source paths that are never worth targeting, shared by every
+# call instead of being rebuilt for each function.
+DISCARDED_FUNCTION_NAMES = ('cxx_global_var_init',)
+DISCARDED_PATHS = ('googletest', 'usr/local/bin')
 
 FUZZER_PRE_HEADERS = '''#include <stdlib.h>
 #include <stdint.h>
@@ -47,6 +57,16 @@ def setup_model(model: str):
   LLM_MODEL = model
 
 
+def get_openai_client() -> 'openai.OpenAI':
+  """Returns the shared OpenAI client."""
+  global OPENAI_CLIENT
+  if OPENAI_CLIENT is None:
+    # Imported lazily: openai is only required when LLM_MODEL is openai.
+    import openai
+    OPENAI_CLIENT = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+  return OPENAI_CLIENT
+
+
 def get_all_files_in_path(base_path: str,
                           path_to_subtract: Optional[str] = None) -> List[str]:
   """Gets all files in a tree and returns as a list of strings."""
@@ -86,21 +106,6 @@ def determine_project_language(path: str) -> str:
   return target_language
 
 
-def get_all_binary_files_from_folder(path: str) -> Dict[str, List[str]]:
-  """Extracts binary artifacts from a list of files, based on file suffix."""
-  all_files = get_all_files_in_path(path, path)
-
-  executable_files = {'static-libs': [], 'dynamic-libs': [], 'object-files': []}
-  for fil in all_files:
-    if fil.endswith('.o'):
-      executable_files['object-files'].append(fil)
-    if fil.endswith('.a'):
-      executable_files['static-libs'].append(fil)
-    if fil.endswith('.so'):
-      executable_files['dynamic-libs'].append(fil)
-  return executable_files
-
-
 def get_all_functions_in_project(introspection_files_found):
   all_functions_in_project = []
   for fi_yaml_file in introspection_files_found:
@@ -116,23 +121,18 @@ def get_all_functions_in_project(introspection_files_found):
 #### Heuristics for auto generating harnesses ####
 ##################################################
 
-GLOBAL_FUZZER_SOURCE_CACHE = {}
+# Maps heuristic name -> {function name: fuzzer source}.
+GLOBAL_FUZZER_SOURCE_CACHE: Dict[str, Dict[str, str]] = {}
 
 
 def get_source_from_cache(heuristic_name, target_func):
-  funcs_in_cache = GLOBAL_FUZZER_SOURCE_CACHE.get(heuristic_name, [])
-  if len(funcs_in_cache) == 0:
-    return None
-  for func, target_source in funcs_in_cache:
-    if func['Func name'] == target_func['Func name']:
-      return target_source
-  return None
+  return GLOBAL_FUZZER_SOURCE_CACHE.get(heuristic_name,
+                                        {}).get(target_func['Func name'])
 
 
 def add_to_source_cache(heuristic_name, target_func, fuzzer_source):
-  funcs_in_cache = GLOBAL_FUZZER_SOURCE_CACHE.get(heuristic_name, [])
-  funcs_in_cache.append((target_func, fuzzer_source))
-  GLOBAL_FUZZER_SOURCE_CACHE[heuristic_name] = funcs_in_cache
+  funcs_in_cache = GLOBAL_FUZZER_SOURCE_CACHE.setdefault(heuristic_name, {})
+  funcs_in_cache[target_func['Func name']] = fuzzer_source
 
 
 class FuzzHeuristicGeneratorBase:
@@ -180,14 +180,14 @@ class FuzzHeuristicGeneratorBase:
     """Communicate to OpenAI prompt and extract harness source code."""
 
     if LLM_MODEL == 'openai':
-      client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-      completion = client.chat.completions.create(model="gpt-3.5-turbo",
-                                                  messages=[
-                                                      {
-                                                          'role': 'system',
-                                                          'content': prompt
-                                                      },
-                                                  ])
+      completion = get_openai_client().chat.completions.create(
+          model="gpt-3.5-turbo",
+          messages=[
+              {
+                  'role': 'system',
+                  'content': prompt
+              },
+          ])
       fuzzer_source = completion.choices[0].message.content
       if fuzzer_source is None:
         return ''
@@ -196,6 +196,7 @@ class FuzzHeuristicGeneratorBase:
                                                        '').replace('```', '')
     elif LLM_MODEL == 'vertex':
       print('Using vertex')
+      # Imported lazily: vertexai is only required when LLM_MODEL is vertex.
       from vertexai.language_models import CodeGenerationModel
       parameters = {'temperature': 0.5, 'max_output_tokens': 512}
       code_generation_model = CodeGenerationModel.from_pretrained(
@@ -239,16 +240,25 @@ class FuzzHeuristicGeneratorBase:
     return uniq_targets
 
 
+@functools.lru_cache(maxsize=64)
+def _read_source_lines(source_file: str, mtime_ns: int) -> List[str]:
+  """Returns the lines of |source_file|, cached per file version."""
+  del mtime_ns  # Only part of the cache key.
+  with open(source_file, 'r') as f:
+    return f.read().split('\n')
+
+
 def get_fuzzer_source_code(func: Dict[str, Any]) -> str:
   """Returns source code as string of a given introspector function."""
   source_file = func['Functions filename']
   src_begin_line = int(func['debug_function_info']['source']['source_line'])
   src_end_line = int(func['source_line_end'])
 
-  with open(source_file, 'r') as f:
-    file_content = f.read()
-    split_lines = file_content.split('\n')
-    source_code = '\n'.join(split_lines[src_begin_line - 1:src_end_line])
+  # Many targets and their cross references live in the same file, so read
+  # and split each file once instead of once per function.
+  split_lines = _read_source_lines(source_file,
+                                   os.stat(source_file).st_mtime_ns)
+  source_code = '\n'.join(split_lines[src_begin_line - 1:src_end_line])
   return source_code
 
 
@@ -729,8 +739,7 @@ def refine_and_filter_introspector_functions(all_functions_in_project):
     except:
       demangled = func['functionName']
 
-    discarded_function_names = {'cxx_global_var_init'}
-    for funcname in discarded_function_names:
+    for funcname in DISCARDED_FUNCTION_NAMES:
       if funcname in demangled:
         to_cont = False
         break
@@ -738,12 +747,7 @@ def refine_and_filter_introspector_functions(all_functions_in_project):
     src_file = func['functionSourceFile']
     if src_file.strip() == '':
       continue
-    discarded_paths = {
-        'googletest',
-        'usr/local/bin',
-    }
-
-    for discarded_path in discarded_paths:
+    for discarded_path in DISCARDED_PATHS:
       if discarded_path in src_file:
         to_cont = False
         break
@@ -981,7 +985,7 @@ def evaluate_heuristic(test_dir, result_to_validate, fuzzer_intrinsics,
 
   # Dump introspector report so we can debug it
   with open(os.path.join(fuzzer_gen_dir, 'summary.json'), 'w') as f:
-    json.dump(introspector_report, f)
+    f.write(json.dumps(introspector_report))
 
   # Write the fuzzer in the directory where we store the source code, just
   # for covenience so we can easily see later.
@@ -1268,7 +1272,7 @@ def auto_generate(github_url,
                           shell=True)
 
   # Stage 1: Build script generation
-  initial_executable_files = get_all_binary_files_from_folder(
+  initial_executable_files = build_generator.get_all_binary_files_from_folder(
       os.path.abspath(os.path.join(os.getcwd(), dst_folder)))
 
   language = determine_project_language(os.path.join(os.getcwd(), dst_folder))
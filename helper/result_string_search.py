@@ -27,6 +27,7 @@ Optionally:
 """
 import argparse
 import logging
+import mmap
 import os
 
 
@@ -76,6 +77,17 @@ def _parse_args() -> argparse.Namespace:
   return args
 
 
+def _contains_bytes(file_path: str, needle: bytes) -> bool:
+  """Returns True if the raw bytes of |file_path| contain |needle|."""
+  # Scans the memory-mapped file without decoding it line by line, so that
+  # large files (e.g. log files) without a match are skipped cheaply.
+  with open(file_path, 'rb') as f:
+    if os.fstat(f.fileno()).st_size == 0:
+      return not needle
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+      return mm.find(needle) != -1
+
+
 def find_in_dir(search_lines: list[str], file_paths: list[str]) -> bool:
   """Returns True if any file in |file_paths| contains |search_lines|."""
   # Caveat: With support for multiline search in potentially large files
@@ -84,7 +96,10 @@ def find_in_dir(search_lines: list[str], file_paths: list[str]) -> bool:
   # other_text <search line 1> other_text
   # other_text <search line 2> other_text
   # can be found in the file.
+  first_line = search_lines[0].encode()
   for file_path in file_paths:
+    if not _contains_bytes(file_path, first_line):
+      continue
     with open(file_path) as f:
       count = 0
       for _, line in enumerate(f):
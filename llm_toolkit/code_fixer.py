@@ -28,8 +28,26 @@ from llm_toolkit import output_parser as parser
 from llm_toolkit import prompt_builder
 
 ERROR_LINES = 20
-NO_MEMBER_ERROR_REGEX = r"error: no member named '.*' in '([^':]*):?.*'"
-FILE_NOT_FOUND_ERROR_REGEX = r"fatal error: '([^']*)' file not found"
+NO_MEMBER_ERROR_REGEX = re.compile(
+    r"error: no member named '.*' in '([^':]*):?.*'")
+FILE_NOT_FOUND_ERROR_REGEX = re.compile(
+    r"fatal error: '([^']*)' file not found")
+ERROR_END_REGEX = re.compile(r'.*\d+ errors? generated.\n?')
+DIAG_ERROR_REGEX = re.compile(r'(\S*):\d+:\d+: (.+): (.+)')
+INCLUDE_ERROR_REGEX = re.compile(r'In file included from (\S*):\d+:')
+# Lines calling functions that do not exist in libpng-proto.
+NONEXIST_PNG_FUNCTION_REGEX = re.compile(
+    r'.*(?:png_init_io|png_set_write_fn|png_set_compression_level'
+    r'|.png_write_).*')
+# Builtin library functions and the include statement they require.
+BUILTIN_LIBRARY_FUNCTIONS = {
+    'malloc': '#include <stdlib.h>',
+    'calloc': '#include <stdlib.h>',
+    'free': '#include <stdlib.h>',
+    'memcpy': '#include <string.h>',
+}
+BUILTIN_LIBRARY_FUNCTION_REGEX = re.compile('|'.join(
+    re.escape(function) for function in BUILTIN_LIBRARY_FUNCTIONS))
 
 # The following strings identify errors when a C fuzz target attempts to use
 # FuzzedDataProvider.
@@ -174,30 +192,18 @@ def insert_stdint(content: str) -> str:
 
 def remove_nonexist_png_functions(content: str) -> str:
   """Removes non-exist functions in libpng-proto."""
-  non_exist_functions = [
-      r'.*png_init_io.*',
-      r'.*png_set_write_fn.*',
-      r'.*png_set_compression_level.*',
-      r'.*.png_write_.*',
-  ]
-  for pattern in non_exist_functions:
-    content = re.sub(pattern, '', content)
-  return content
+  return NONEXIST_PNG_FUNCTION_REGEX.sub('', content)
 
 
 def include_builtin_library(content: str) -> str:
   """Includes builtin libraries when its function was invoked."""
-  library_function_dict = {
-      '#include <stdlib.h>': [
-          'malloc',
-          'calloc',
-          'free',
-      ],
-      '#include <string.h>': ['memcpy',]
+  # Scan the content once for all functions instead of once per function.
+  used_libraries = {
+      BUILTIN_LIBRARY_FUNCTIONS[match.group(0)]
+      for match in BUILTIN_LIBRARY_FUNCTION_REGEX.finditer(content)
   }
-  for library, functions in library_function_dict.items():
-    use_lib_functions = any(f in content for f in functions)
-    if use_lib_functions and not library in content:
+  for library in dict.fromkeys(BUILTIN_LIBRARY_FUNCTIONS.values()):
+    if library in used_libraries and not library in content:
       content = f'{library}\n{content}'
   return content
 
@@ -229,19 +235,13 @@ def extract_error_message(log_path: str,
                           project_target_basename: str) -> list[str]:
   """Extracts error message and its context from the file in |log_path|."""
 
-  with open(log_path) as log_file:
-    # A more accurate way to extract the error message.
-    log_lines = log_file.readlines()
-
   target_name, _ = os.path.splitext(project_target_basename)
 
-  error_lines_range: list[Optional[int]] = [None, None]
-  temp_range: list[Optional[int]] = [None, None]
-
-  error_start_pattern = r'\S*' + target_name + r'(\.\S*)?:\d+:\d+: .+: .+\n?'
-  error_include_pattern = (r'In file included from \S*' + target_name +
-                           r'(\.\S*)?:\d+:\n?')
-  error_end_pattern = r'.*\d+ errors? generated.\n?'
+  # Compiled once per log rather than looked up again for every line.
+  error_start_pattern = re.compile(r'\S*' + target_name +
+                                   r'(\.\S*)?:\d+:\d+: .+: .+\n?')
+  error_include_pattern = re.compile(r'In file included from \S*' +
+                                     target_name + r'(\.\S*)?:\d+:\n?')
 
   error_keywords = [
       'multiple definition of',
@@ -249,37 +249,47 @@ def extract_error_message(log_path: str,
   ]
   errors = []
   unique_symbol = set()
-  for i, line in enumerate(log_lines):
-    # Add GNU ld errors in interest.
-    found_keyword = False
-    for keyword in error_keywords:
-      if keyword not in line:
+  # Stream the log and only keep the lines of the diagnostic block being
+  # parsed, instead of holding the whole build log in memory.
+  error_block: Optional[list[str]] = None
+  current_block: Optional[list[str]] = None
+  with open(log_path) as log_file:
+    for line in log_file:
+      # Add GNU ld errors in interest.
+      found_keyword = False
+      for keyword in error_keywords:
+        if keyword not in line:
+          continue
+        found_keyword = True
+        symbol = line.split(keyword)[-1]
+        if symbol not in unique_symbol:
+          unique_symbol.add(symbol)
+          errors.append(line.rstrip())
+        break
+      if found_keyword:
+        if current_block is not None:
+          current_block.append(line)
         continue
-      found_keyword = True
-      symbol = line.split(keyword)[-1]
-      if symbol not in unique_symbol:
-        unique_symbol.add(symbol)
-        errors.append(line.rstrip())
-      break
-    if found_keyword:
-      continue
 
-    # Add clang/clang++ diagnostics.
-    if (temp_range[0] is None and (re.fullmatch(error_include_pattern, line) or
-                                   re.fullmatch(error_start_pattern, line))):
-      temp_range[0] = i
-    if temp_range[0] is not None and re.fullmatch(error_end_pattern, line):
-      temp_range[1] = i - 1  # Exclude current line.
-      # In case the original fuzz target was written in C and building with
-      # clang failed, and building with clang++ also failed, we take the
-      # error from clang++, which comes after.
-      error_lines_range = temp_range
-      temp_range = [None, None]
-
-  if error_lines_range[0] is not None and error_lines_range[1] is not None:
-    errors.extend(
-        line.rstrip()
-        for line in log_lines[error_lines_range[0]:error_lines_range[1] + 1])
+      # Add clang/clang++ diagnostics.
+      if (current_block is None and (error_include_pattern.fullmatch(line) or
+                                     error_start_pattern.fullmatch(line))):
+        current_block = []
+      if current_block is None:
+        continue
+      # Cheap substring test first, most lines are not the error summary.
+      if ' generated' in line and ERROR_END_REGEX.fullmatch(line):
+        # The current line is excluded from the block.
+        # In case the original fuzz target was written in C and building with
+        # clang failed, and building with clang++ also failed, we take the
+        # error from clang++, which comes after.
+        error_block = current_block
+        current_block = None
+      else:
+        current_block.append(line)
+
+  if error_block is not None:
+    errors.extend(line.rstrip() for line in error_block)
 
   if not errors:
     logging.warning('Failed to parse error message from %s.', log_path)
@@ -292,8 +302,6 @@ def group_error_messages(error_lines: list[str]) -> list[str]:
   state_include = 'INCLUDE'
   state_diag = 'DIAG'
 
-  diag_error_pattern = re.compile(r'(\S*):\d+:\d+: (.+): (.+)')
-  include_error_pattern = re.compile(r'In file included from (\S*):\d+:')
   error_blocks = []
   curr_block = []
   src_file = ''
@@ -302,8 +310,9 @@ def group_error_messages(error_lines: list[str]) -> list[str]:
     if not line:  # Trim empty lines.
       continue
 
-    diag_match = diag_error_pattern.fullmatch(line)
-    include_match = include_error_pattern.fullmatch(line)
+    diag_match = DIAG_ERROR_REGEX.fullmatch(line)
+    # A diag line never starts with 'In file included from'.
+    include_match = None if diag_match else INCLUDE_ERROR_REGEX.fullmatch(line)
 
     if diag_match:
       err_src = diag_match.group(1)
@@ -441,7 +450,7 @@ def _collect_context(benchmark: benchmarklib.Benchmark,
 def _collect_context_no_member(benchmark: benchmarklib.Benchmark,
                                error: str) -> str:
   """Collects the useful context to fix 'no member in' errors."""
-  matched = re.search(NO_MEMBER_ERROR_REGEX, error)
+  matched = NO_MEMBER_ERROR_REGEX.search(error)
   if not matched:
     return ''
   target_type = matched.group(1)
@@ -459,8 +468,8 @@ def _collect_instructions(benchmark: benchmarklib.Benchmark, errors: list[str],
   for error in errors:
     instruction += _collect_instruction_file_not_found(benchmark, error,
                                                        fuzz_target_source_code)
-    instruction += _collect_instruction_fdp_in_c_target(
-        benchmark, error, fuzz_target_source_code)
+  instruction += _collect_instruction_fdp_in_c_target(benchmark, errors,
+                                                      fuzz_target_source_code)
   return instruction
 
 
@@ -468,7 +477,7 @@ def _collect_instruction_file_not_found(benchmark: benchmarklib.Benchmark,
                                         error: str,
                                         fuzz_target_source_code: str) -> str:
   """Collects the useful instruction to fix 'file not found' errors."""
-  matched = re.search(FILE_NOT_FOUND_ERROR_REGEX, error)
+  matched = FILE_NOT_FOUND_ERROR_REGEX.search(error)
   if not matched:
     return ''
 
@@ -515,16 +524,19 @@ def _collect_instruction_file_not_found(benchmark: benchmarklib.Benchmark,
 
 
 def _collect_instruction_fdp_in_c_target(benchmark: benchmarklib.Benchmark,
-                                         error: str,
+                                         errors: list[str],
                                          fuzz_target_source_code: str) -> str:
   """Collects instructions to ask LLM do not use FuzzedDataProvier in C targets
   """
-  has_error_from_fdp = (FALSE_EXTERN_KEYWORD_ERROR in error or
-                        FALSE_FUZZED_DATA_PROVIDER_ERROR in error)
+  if not errors or benchmark.file_type != benchmarklib.FileType.C:
+    return ''
+
+  # Cheapest checks first, the errors are only scanned until the first hit.
   include_fdp = ('#include <fuzzer/FuzzedDataProvider.h>'
                  in fuzz_target_source_code)
-  is_c = benchmark.file_type == benchmarklib.FileType.C
-  if (has_error_from_fdp or include_fdp) and is_c:
+  if include_fdp or any(FALSE_EXTERN_KEYWORD_ERROR in error or
+                        FALSE_FUZZED_DATA_PROVIDER_ERROR in error
+                        for error in errors):
     return (
         'Please modify the generated C fuzz target to remove'
         '<code>FuzzedDataProvider</code> and replace all its functionalities '
@@ -15,6 +15,7 @@
 LLM models and their functions.
 """
 
+import functools
 import logging
 import os
 import random
@@ -25,6 +26,7 @@ import tempfile
 import time
 import traceback
 from abc import abstractmethod
+from multiprocessing import pool
 from typing import Any, Callable, Type
 
 import openai
@@ -41,6 +43,40 @@ from llm_toolkit import prompts
 MAX_TOKENS: int = 2000
 NUM_SAMPLES: int = 1
 TEMPERATURE: float = 0.4
+# WARN: Avoid large LLM_NUM_CONCURRENT_SAMPLES in parallelized experiments.
+# It controls the number of samples each experiment requests from Vertex AI
+# concurrently (capped at NUM_SAMPLES), on top of {run_all_experiments.NUM_EXP}
+# experiments and {run_one_experiment.NUM_EVA} evaluations in parallel, which
+# may exceed your Vertex AI quota. Samples are requested one at a time by
+# default.
+NUM_CONCURRENT_SAMPLES: int = 1
+
+
+def _get_num_concurrent_samples() -> int:
+  """Returns the number of samples to request concurrently."""
+  value = os.getenv('LLM_NUM_CONCURRENT_SAMPLES', '')
+  if not value:
+    return NUM_CONCURRENT_SAMPLES
+  try:
+    num = int(value)
+  except ValueError:
+    num = 0
+  if num < 1:
+    logging.warning(
+        'Invalid LLM_NUM_CONCURRENT_SAMPLES %r, expected a positive integer, '
+        'using the default %d.', value, NUM_CONCURRENT_SAMPLES)
+    return NUM_CONCURRENT_SAMPLES
+  return num
+
+
+class ContextWindowExceededError(ValueError):
+  """Raised when a prompt does not fit the context window of a model."""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key: str) -> openai.OpenAI:
+  """Returns a client shared by all models using |api_key|."""
+  return openai.OpenAI(api_key=api_key)
 
 
 class LLM:
@@ -194,17 +230,21 @@ class GPT(LLM):
   name = 'gpt-3.5-turbo'
 
   # ================================ Prompt ================================ #
-  def estimate_token_num(self, text) -> int:
-    """Estimates the number of tokens in |text|."""
-    # https://cookbook.openai.com/examples/how_to_count_tokens_with_tiktoken
+  @functools.cached_property
+  def _encoder(self) -> tiktoken.Encoding:
+    """The tiktoken encoder for this model, looked up once per instance."""
     try:
       if 'gpt-4' in self.name:  # gpt-4 and gpt-4o
-        encoder = tiktoken.encoding_for_model('gpt-4')
-      else:
-        encoder = tiktoken.encoding_for_model(self.name)
+        return tiktoken.encoding_for_model('gpt-4')
+      return tiktoken.encoding_for_model(self.name)
     except KeyError:
       print(f'Could not get a tiktoken encoding for {self.name}.')
-      encoder = tiktoken.get_encoding('cl100k_base')
+      return tiktoken.get_encoding('cl100k_base')
+
+  def estimate_token_num(self, text) -> int:
+    """Estimates the number of tokens in |text|."""
+    # https://cookbook.openai.com/examples/how_to_count_tokens_with_tiktoken
+    encoder = self._encoder
 
     num_tokens = 0
     for message in text:
@@ -221,6 +261,13 @@ class GPT(LLM):
     return prompts.OpenAIPrompt
 
   # ============================== Generation ============================== #
+  @functools.cached_property
+  def _client(self) -> openai.OpenAI:
+    """A shared client, so its HTTP connection pool is reused across calls."""
+    # Fixer and triager models are set up afresh for every attempt, share the
+    # client across instances rather than building one per model.
+    return _get_openai_client(os.getenv('OPENAI_API_KEY'))
+
   def generate_code(self,
                     prompt: prompts.Prompt,
                     response_dir: str,
@@ -228,13 +275,13 @@ class GPT(LLM):
     """Generates code with OpenAI's API."""
     if self.ai_binary:
       print(f'OpenAI does not use local AI binary: {self.ai_binary}')
-    client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 
     completion = self.with_retry_on_error(
-        lambda: client.chat.completions.create(messages=prompt.get(),
-                                               model=self.name,
-                                               n=self.num_samples,
-                                               temperature=self.temperature),
+        lambda: self._client.chat.completions.create(
+            messages=prompt.get(),
+            model=self.name,
+            n=self.num_samples,
+            temperature=self.temperature),
         openai.OpenAIError)
     # TODO: Add a default value for completion.
     if log_output:
@@ -331,6 +378,11 @@ class VertexAIModel(GoogleModel):
   def do_generate(self, model: Any, prompt: str, config: dict[str, Any]) -> Any:
     return model.predict(prefix=prompt, **config).text
 
+  def check_context_window(self, model: Any, prompt: str) -> None:
+    """Raises ContextWindowExceededError if |prompt| does not fit the context
+    window of |model|."""
+    del model, prompt
+
   def generate_code(self,
                     prompt: prompts.Prompt,
                     response_dir: str,
@@ -340,49 +392,80 @@ class VertexAIModel(GoogleModel):
       print(f'VertexAI does not use local AI binary: {self.ai_binary}')
 
     model = self.get_model()
+    self.check_context_window(model, prompt.get())
     parameters = {
         'temperature': self.temperature,
         'max_output_tokens': self._max_output_tokens,
     }
 
-    for index in range(self.num_samples):
+    def _generate_sample(index: int) -> None:
       response = self.with_retry_on_error(
           lambda: self.do_generate(model, prompt.get(), parameters),
           GoogleAPICallError) or ''
       self._save_output(index, response, response_dir)
 
+    num_threads = min(self.num_samples, _get_num_concurrent_samples())
+    if num_threads <= 1:
+      for index in range(self.num_samples):
+        _generate_sample(index)
+      return
+
+    # Samples are independent queries, overlap their network round-trips.
+    with pool.ThreadPool(num_threads) as p:
+      p.map(_generate_sample, range(self.num_samples))
+
 
 class GeminiModel(VertexAIModel):
   """Gemini models."""
 
+  # Loosen inapplicable restrictions just in case.
+  _safety_config = [
+      generative_models.SafetySetting(
+          category=generative_models.HarmCategory.
+          HARM_CATEGORY_DANGEROUS_CONTENT,
+          threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
+      ),
+      generative_models.SafetySetting(
+          category=generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT,
+          threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
+      ),
+      generative_models.SafetySetting(
+          category=generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+          threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
+      ),
+      generative_models.SafetySetting(
+          category=generative_models.HarmCategory.
+          HARM_CATEGORY_SEXUALLY_EXPLICIT,
+          threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
+      ),
+  ]
+
   def get_model(self) -> Any:
     return GenerativeModel(self._vertex_ai_model)
 
+  def check_context_window(self, model: Any, prompt: str) -> None:
+    # Gemini models declare their real context window, fail fast locally
+    # instead of spending a round-trip (and retries) on an oversized prompt.
+    prompt_tokens = self.estimate_token_num(prompt)
+    if prompt_tokens <= self.context_window:
+      return
+
+    # The local estimate is coarse, confirm it with the real token count.
+    try:
+      prompt_tokens = model.count_tokens(prompt).total_tokens
+    except GoogleAPICallError as err:
+      logging.warning(
+          'Failed to count prompt tokens with %s, using the estimate: %s',
+          self.name, err)
+    if prompt_tokens > self.context_window:
+      raise ContextWindowExceededError(
+          f'Prompt of {prompt_tokens} tokens exceeds the '
+          f'{self.context_window}-token context window of {self.name}.')
+
   def do_generate(self, model: Any, prompt: str, config: dict[str, Any]) -> Any:
-    # Loosen inapplicable restrictions just in case.
-    safety_config = [
-        generative_models.SafetySetting(
-            category=generative_models.HarmCategory.
-            HARM_CATEGORY_DANGEROUS_CONTENT,
-            threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-        ),
-        generative_models.SafetySetting(
-            category=generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT,
-            threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-        ),
-        generative_models.SafetySetting(
-            category=generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-            threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-        ),
-        generative_models.SafetySetting(
-            category=generative_models.HarmCategory.
-            HARM_CATEGORY_SEXUALLY_EXPLICIT,
-            threshold=generative_models.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-        ),
-    ]
     return model.generate_content(prompt,
                                   generation_config=config,
-                                  safety_settings=safety_config).text
+                                  safety_settings=self._safety_config).text
 
 
 class VertexAICodeBisonModel(VertexAIModel):
@@ -21,6 +21,14 @@ import sys
 from llm_toolkit.crash_triager import TriageResult
 
 RAW_OUTPUT_EXT = '.rawoutput'
+# Start and end markers of code blocks, applied in order.
+CODE_BLOCK_MARKERS = [
+    ('```c', '```'),
+    ('```java', '```'),
+    ('```java_code', '```'),
+    ('<code>', '</code>'),
+    ('<java_code>', '</java_code>'),
+]
 
 
 def is_raw_output(file: str) -> bool:
@@ -46,26 +54,30 @@ def parse_args() -> argparse.Namespace:
   return args
 
 
-def _parse_code_block_by_marker(lines: list[str], start_marker: str,
-                                end_marker: str) -> list[str]:
-  """Parses code block lines based on markers."""
-  block = []
+def _parse_code_block_by_marker(
+    lines: list[str], lower_lines: list[str], start_marker: str,
+    end_marker: str) -> tuple[list[str], list[str]]:
+  """Parses code block lines based on markers. |lower_lines| are the
+  lowercased |lines|, the block is returned in both forms."""
+  block, lower_block = [], []
   in_block = False
   contains_api = False
 
-  for line in lines:
-    if not in_block and start_marker in line.lower():
+  for line, lower_line in zip(lines, lower_lines):
+    if not in_block and start_marker in lower_line:
       in_block = True  # Start a code block.
       if not contains_api:
-        block = []  # Ignore previous block because it does not contain API.
+        # Ignore previous block because it does not contain API.
+        block, lower_block = [], []
     elif in_block and end_marker in line:
       in_block = False  # Finish a code block.
       if contains_api:
         break  # Found fuzz target.
     elif in_block:
       block.append(line)
+      lower_block.append(lower_line)
       contains_api = contains_api or 'LLVMFuzzerTestOneInput' in line
-  return block if block else lines
+  return (block, lower_block) if block else (lines, lower_lines)
 
 
 def parse_code(response_path: str) -> str:
@@ -74,11 +86,11 @@ def parse_code(response_path: str) -> str:
     response = file.read()
   solution = response.split('</solution>')[0]
   lines = solution.splitlines()
-  lines = _parse_code_block_by_marker(lines, '```c', '```')
-  lines = _parse_code_block_by_marker(lines, '```java', '```')
-  lines = _parse_code_block_by_marker(lines, '```java_code', '```')
-  lines = _parse_code_block_by_marker(lines, '<code>', '</code>')
-  lines = _parse_code_block_by_marker(lines, '<java_code>', '</java_code>')
+  # Lowercase once, rather than once per marker.
+  lower_lines = [line.lower() for line in lines]
+  for start_marker, end_marker in CODE_BLOCK_MARKERS:
+    lines, lower_lines = _parse_code_block_by_marker(lines, lower_lines,
+                                                     start_marker, end_marker)
 
   # Remove leading and trailing empty lines.
   while lines and not lines[0].strip():
@@ -15,10 +15,12 @@
 Prompt building tools.
 """
 
+import functools
 import logging
 import os
 import re
 from abc import abstractmethod
+from multiprocessing import pool
 from typing import Optional, Tuple
 
 import jinja2
@@ -73,6 +75,24 @@ FUZZ_ERROR_SUMMARY = 'The code can build successfully but has a runtime issue: '
 
 C_PROMPT_HEADERS_TO_ALWAYS_INCLUDES = ['stdio.h', 'stdlib.h', 'stdint.h']
 
+# Matches the invalid FuzzedDataProvider::consumeInt(int) calls in JVM targets.
+JVM_WRONG_CONSUME_INT_REGEX = re.compile(r'data\.consumeInt\(([0-9]+)\)')
+
+
+@functools.lru_cache(maxsize=None)
+def _read_template(template_file: str) -> str:
+  """Reads |template_file|, which does not change during an experiment."""
+  with open(template_file) as file:
+    return file.read()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_jinja_template(template_file: str) -> jinja2.Template:
+  """Compiles the jinja2 template in |template_file| once per experiment."""
+  return jinja2.Template(_read_template(template_file),
+                         trim_blocks=True,
+                         lstrip_blocks=True)
+
 
 class PromptBuilder:
   """Prompt builder."""
@@ -107,6 +127,20 @@ class PromptBuilder:
     # return the same by default
     return generated_code
 
+  def _find_template(self, template_dir: str, template_name: str) -> str:
+    """Finds template file based on |template_dir|."""
+    preferred_template = os.path.join(template_dir, template_name)
+    # Use the preferred template if it exists.
+    if os.path.isfile(preferred_template):
+      return preferred_template
+    # Fall back to the default template.
+    default_template = os.path.join(DEFAULT_TEMPLATE_DIR, template_name)
+    return default_template
+
+  def _get_template(self, template_file: str) -> str:
+    """Reads the template for prompts."""
+    return _read_template(template_file)
+
 
 class DefaultTemplateBuilder(PromptBuilder):
   """Default builder for C/C++."""
@@ -157,21 +191,6 @@ class DefaultTemplateBuilder(PromptBuilder):
     priming = priming.replace('{TYPE_SPECIFIC_PRIMING}', type_specific_priming)
     return priming
 
-  def _find_template(self, template_dir: str, template_name: str) -> str:
-    """Finds template file based on |template_dir|."""
-    preferred_template = os.path.join(template_dir, template_name)
-    # Use the preferred template if it exists.
-    if os.path.isfile(preferred_template):
-      return preferred_template
-    # Fall back to the default template.
-    default_template = os.path.join(DEFAULT_TEMPLATE_DIR, template_name)
-    return default_template
-
-  def _get_template(self, template_file: str) -> str:
-    """Reads the template for prompts."""
-    with open(template_file) as file:
-      return file.read()
-
   def format_problem(self, problem_content: str) -> str:
     """Formats a problem based on the prompt template."""
     problem = self._get_template(self.problem_template_file)
@@ -185,9 +204,7 @@ class DefaultTemplateBuilder(PromptBuilder):
     return solution
 
   def format_context(self, context_info: dict) -> str:
-    context = jinja2.Template(self._get_template(self.context_template_file),
-                              trim_blocks=True,
-                              lstrip_blocks=True)
+    context = _load_jinja_template(self.context_template_file)
     return context.render(
         headers='\n'.join(context_info['files']),
         must_insert=context_info['decl'],
@@ -243,11 +260,9 @@ class DefaultTemplateBuilder(PromptBuilder):
     # Collect all examples in a single list
     examples = []
     for problem, solution in example_files:
-      with open(problem) as problem_file:
-        problem = problem_file.read()[:-1]
-      with open(solution) as solution_file:
-        solution = solution_file.read()[:-1]
-        solution = project_targets.filter_target_lines(solution)
+      problem = _read_template(problem)[:-1]
+      solution = _read_template(solution)[:-1]
+      solution = project_targets.filter_target_lines(solution)
       examples.append((problem, solution))
     # TODO(mihaimaruseac): Should we start from these first?
     if example_content:
@@ -311,8 +326,8 @@ class DefaultTemplateBuilder(PromptBuilder):
 
   def _format_fixer_priming(self, benchmark: Benchmark) -> Tuple[str, int]:
     """Formats a priming for code fixer based on the template."""
-    with open(self.fixer_priming_template_file) as f:
-      priming = f.read().strip() + '\n'
+    priming = self._get_template(
+        self.fixer_priming_template_file).strip() + '\n'
     priming = priming.replace('{LANGUAGE}', benchmark.file_type.value)
     if benchmark.needs_extern:
       priming += ('\nNote that some code may need to be wrapped with '
@@ -328,8 +343,7 @@ class DefaultTemplateBuilder(PromptBuilder):
                             errors: list[str], priming_weight: int,
                             context: str, instruction: str) -> str:
     """Formats a problem for code fixer based on the template."""
-    with open(self.fixer_problem_template_file) as f:
-      problem = f.read().strip()
+    problem = self._get_template(self.fixer_problem_template_file).strip()
     problem = problem.replace('{CODE_TO_BE_FIXED}', raw_code)
     if error_desc:
       error_summary = FUZZ_ERROR_SUMMARY + error_desc
@@ -339,14 +353,14 @@ class DefaultTemplateBuilder(PromptBuilder):
     problem = problem.replace('{ERROR_SUMMARY}', error_summary)
 
     if context:
-      with open(self.fixer_context_template_file) as f:
-        context_template = f.read().strip()
+      context_template = self._get_template(
+          self.fixer_context_template_file).strip()
       context = context_template.replace('{CONTEXT_SOURCE_CODE}', context)
     problem = problem.replace('{CONTEXT}', context)
 
     if instruction:
-      with open(self.fixer_instruction_template_file) as f:
-        instruction_template = f.read().strip()
+      instruction_template = self._get_template(
+          self.fixer_instruction_template_file).strip()
       instruction = instruction_template.replace('{INSTRUCTION}', instruction)
     problem = problem.replace('{INSTRUCTION}', instruction)
 
@@ -404,8 +418,8 @@ class DefaultTemplateBuilder(PromptBuilder):
 
   def _format_triager_priming(self) -> Tuple[str, int]:
     """Formats a priming for crash triage based on the template."""
-    with open(self.triager_priming_template_file) as f:
-      priming = f.read().strip() + '\n'
+    priming = self._get_template(
+        self.triager_priming_template_file).strip() + '\n'
     priming_prompt = self._prompt.create_prompt_piece(priming, 'system')
     priming_weight = self._model.estimate_token_num(priming_prompt)
     # NOTE: We need to return the priming _as text_ and the weight. Otherwise,
@@ -416,18 +430,12 @@ class DefaultTemplateBuilder(PromptBuilder):
                               crash_info: str, crash_func: dict,
                               priming_weight: int) -> str:
     """Formats a problem for crash triage based on the template."""
-    all_func_code = []
-    for func_name, line_number in crash_func.items():
-      if func_name == 'LLVMFuzzerTestOneInput':
-        driver_code = self._slice_driver_code(benchmark.project, driver_code,
-                                              line_number)
-      else:
-        func_code = self._slice_func_code(benchmark.project, func_name,
-                                          line_number)
-        all_func_code.append(func_code)
+    if 'LLVMFuzzerTestOneInput' in crash_func:
+      driver_code = self._slice_driver_code(
+          benchmark.project, driver_code,
+          crash_func['LLVMFuzzerTestOneInput'])
 
-    with open(self.triager_problem_template_file) as f:
-      problem = f.read().strip()
+    problem = self._get_template(self.triager_problem_template_file).strip()
     problem = problem.replace('{CRASH_REPORT}', crash_info.strip())\
                      .replace('{DRIVER_CODE}', driver_code.strip())
 
@@ -442,9 +450,14 @@ class DefaultTemplateBuilder(PromptBuilder):
     # Add extra 20-tokens redundancy
     prompt_size += 20
 
-    # Add function code one by one until we reach the maximum prompt size
+    # Add function code one by one until we reach the maximum prompt size.
+    # Slicing queries introspector, so only slice functions that may still fit.
     selected_func_code = []
-    for func_code in all_func_code:
+    for func_name, line_number in crash_func.items():
+      if func_name == 'LLVMFuzzerTestOneInput':
+        continue
+      func_code = self._slice_func_code(benchmark.project, func_name,
+                                        line_number)
       func_code_prompt = self._prompt.create_prompt_piece(func_code, 'user')
       func_code_token_num = self._model.estimate_token_num(func_code_prompt)
       if prompt_size + func_code_token_num >= self._model.context_window:
@@ -579,21 +592,6 @@ class DefaultJvmTemplateBuilder(PromptBuilder):
     print(f'Cannot retrieve project url of project {project_name}')
     return ''
 
-  def _find_template(self, template_dir: str, template_name: str) -> str:
-    """Finds template file based on |template_dir|."""
-    preferred_template = os.path.join(template_dir, template_name)
-    # Use the preferred template if it exists.
-    if os.path.isfile(preferred_template):
-      return preferred_template
-    # Fall back to the default template.
-    default_template = os.path.join(DEFAULT_TEMPLATE_DIR, template_name)
-    return default_template
-
-  def _get_template(self, template_file: str) -> str:
-    """Reads the template for prompts."""
-    with open(template_file) as file:
-      return file.read()
-
   def _format_target_constructor(self, signature: str) -> str:
     """Formats a constructor based on the prompt template."""
     class_name = signature.split('].')[0][1:]
@@ -666,7 +664,9 @@ class DefaultJvmTemplateBuilder(PromptBuilder):
       if self._need_import(arg_type):
         classes.append(arg_type)
 
-    classes = list(set(classes))
+    # Keep the mapping order stable so identical targets yield identical
+    # prompt prefixes across runs.
+    classes = sorted(set(classes))
     mappings = [self._format_import_mapping(type) for type in classes]
 
     requirement = self._get_template(self.requirement_template_file)
@@ -708,15 +708,21 @@ class DefaultJvmTemplateBuilder(PromptBuilder):
         self.benchmark.project, signature)
 
     # Query for source code of target method callsites
-    xref_source_list = []
-    for xref in introspector.query_introspector_cross_references(
-        self.benchmark.project, signature):
-      xref_source = introspector.query_introspector_function_source(
-          self.benchmark.project, xref)
-      if xref_source:
-        xref_source_list.append(xref_source)
+    xrefs = introspector.query_introspector_cross_references(
+        self.benchmark.project, signature)
+    if not xrefs:
+      return source_code, ''
 
-    return source_code, '\n'.join(xref_source_list)
+    # The queries are independent, so issue them concurrently while keeping
+    # the callsite order.
+    num_threads = min(len(xrefs), introspector.MAX_CONCURRENT_QUERIES)
+    with pool.ThreadPool(num_threads) as p:
+      xref_source_list = p.map(
+          lambda xref: introspector.query_introspector_function_source(
+              self.benchmark.project, xref), xrefs)
+
+    return source_code, '\n'.join(
+        xref_source for xref_source in xref_source_list if xref_source)
 
   def _format_problem(self, signature: str) -> str:
     """Formats a problem based on the prompt template."""
@@ -743,7 +749,8 @@ class DefaultJvmTemplateBuilder(PromptBuilder):
 
   def _has_generic(self, arg: str) -> bool:
     """Determine if the argument type contains generic type."""
-    return '<' in arg and not arg.startswith('<') and arg.endswith('>')
+    # Constant-time prefix and suffix checks first, the scan for '<' last.
+    return arg.endswith('>') and not arg.startswith('<') and '<' in arg
 
   def _need_import(self, class_name: str) -> bool:
     """Determine if the class with class_name needed to be imported."""
@@ -794,11 +801,8 @@ class DefaultJvmTemplateBuilder(PromptBuilder):
     # The fixes here change the calling of data.consumeInt(int) to
     # data.consumeInt(0, int). For example, data.consumeInt(12345) will
     # be replaced by data.consumeInt(0, 12345)
-    for wrong_method_call in re.findall(r'(data\.consumeInt\(([0-9]+)\))',
-                                        generated_code):
-      old_method_call = wrong_method_call[0]
-      new_method_call = f'data.consumeInt(0, {wrong_method_call[1]})'
-      generated_code = generated_code.replace(old_method_call, new_method_call)
+    generated_code = JVM_WRONG_CONSUME_INT_REGEX.sub(r'data.consumeInt(0, \1)',
+                                                     generated_code)
 
     return generated_code
 
@@ -818,21 +822,6 @@ class CSpecificBuilder(PromptBuilder):
     self.priming_template_file = self._find_template(template_dir,
                                                      'c-priming.txt')
 
-  def _find_template(self, template_dir: str, template_name: str) -> str:
-    """Finds template file based on |template_dir|."""
-    preferred_template = os.path.join(template_dir, template_name)
-    # Use the preferred template if it exists.
-    if os.path.isfile(preferred_template):
-      return preferred_template
-    # Fall back to the default template.
-    default_template = os.path.join(DEFAULT_TEMPLATE_DIR, template_name)
-    return default_template
-
-  def _get_template(self, template_file: str) -> str:
-    """Reads the template for prompts."""
-    with open(template_file) as file:
-      return file.read()
-
   def build(self,
             function_signature: str,
             target_file_type: FileType,
@@ -842,8 +831,7 @@ class CSpecificBuilder(PromptBuilder):
             needs_extern: bool = False) -> prompts.Prompt:
     """Constructs a prompt using the templates in |self| and saves it."""
 
-    with open(self.priming_template_file, 'r') as f:
-      prompt_text = f.read()
+    prompt_text = self._get_template(self.priming_template_file)
 
     # Format the priming
     target_repository = oss_fuzz_checkout.get_project_repository(
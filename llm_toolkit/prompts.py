@@ -132,4 +132,6 @@ class OpenAIPrompt(Prompt):
   def save(self, location: str) -> None:
     """Saves the prompt to a filelocation."""
     with open(location, 'w+') as prompt_file:
-      json.dump(self._prompt, prompt_file)
+      # json.dumps uses the C encoder, json.dump streams through the
+      # pure-Python one.
+      prompt_file.write(json.dumps(self._prompt))
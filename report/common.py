@@ -18,7 +18,6 @@ import io
 import json
 import logging
 import os
-import re
 from typing import List, Optional
 
 import yaml
@@ -272,7 +271,7 @@ class Results:
       f.seek(log_size - truncated_len - 1, os.SEEK_SET)
       logs_ending = f.read()
 
-      return logs_beginning + '\n...truncated...\n' + logs_ending
+      return f'{logs_beginning}\n...truncated...\n{logs_ending}'
 
     return ''
 
@@ -328,7 +327,8 @@ class Results:
   def get_prompt(self, benchmark: str) -> Optional[str]:
     root_dir = os.path.join(self._results_dir, benchmark)
     for name in FileSystem(root_dir).listdir():
-      if re.match(r'^prompt.*txt$', name):
+      # Same as matching r'^prompt.*txt$', without the regex engine.
+      if name.startswith('prompt') and name[len('prompt'):].endswith('txt'):
         with FileSystem(os.path.join(root_dir, name)).open() as f:
           content = f.read()
 
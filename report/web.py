@@ -81,6 +81,9 @@ class GenerateReport:
     self._results = results
     self._output_dir = output_dir
     self._jinja = jinja_env
+    # Directories already known to exist, so that writing every sample page
+    # does not re-check the same benchmark directory.
+    self._prepared_dirs = set()
 
   def generate(self):
     """Generate and write every report file."""
@@ -107,12 +110,14 @@ class GenerateReport:
     full_path = os.path.join(self._output_dir, output_path)
 
     parent_dir = os.path.dirname(full_path)
-    if not FileSystem(parent_dir).exists():
-      FileSystem(parent_dir).makedirs()
-
-    if not FileSystem(parent_dir).isdir():
-      raise Exception(
-          f'Writing to {full_path} but {parent_dir} is not a directory!')
+    if parent_dir not in self._prepared_dirs:
+      if not FileSystem(parent_dir).exists():
+        FileSystem(parent_dir).makedirs()
+
+      if not FileSystem(parent_dir).isdir():
+        raise Exception(
+            f'Writing to {full_path} but {parent_dir} is not a directory!')
+      self._prepared_dirs.add(parent_dir)
 
     with FileSystem(full_path).open('w', encoding='utf-8') as f:
       f.write(content)
@@ -108,7 +108,7 @@ def get_experiment_configs(
     benchmark_yamls = [
         os.path.join(args.benchmarks_directory, file)
         for file in os.listdir(args.benchmarks_directory)
-        if file.endswith('.yaml') or file.endswith('yml')
+        if file.endswith(('.yaml', 'yml'))
     ]
   experiment_configs = []
   for benchmark_file in benchmark_yamls:
@@ -247,9 +247,8 @@ def parse_args() -> argparse.Namespace:
 
   benchmark_yaml = args.benchmark_yaml
   if benchmark_yaml:
-    assert (benchmark_yaml.endswith('.yaml') or
-            benchmark_yaml.endswith('yml')), (
-                "--benchmark-yaml needs to take an YAML file.")
+    assert benchmark_yaml.endswith(('.yaml', 'yml')), (
+        "--benchmark-yaml needs to take an YAML file.")
 
   bench_yml = bool(benchmark_yaml)
   bench_dir = bool(args.benchmarks_directory)
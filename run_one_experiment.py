@@ -129,17 +129,17 @@ def fix_code(work_dirs: WorkDirs, generated_targets: List[str]) -> List[str]:
 def aggregate_results(target_stats: list[tuple[int, exp_evaluator.Result]],
                       generated_targets: list[str]) -> AggregatedResult:
   """Aggregates experiment status and results of a targets."""
-  build_success_rate = sum([int(stat.compiles) for _, stat in target_stats
-                           ]) / len(target_stats)
-  crash_rate = sum([int(stat.crashes) for _, stat in target_stats
-                   ]) / len(target_stats)
-  found_bug = sum([
-      int(stat.crashes and not stat.is_semantic_error)
-      for _, stat in target_stats
-  ])
-  max_coverage = max([stat.coverage for _, stat in target_stats])
+  # Tally all counters in a single pass instead of one temporary list each.
+  compiles = crashes = found_bug = 0
+  for _, stat in target_stats:
+    compiles += int(stat.compiles)
+    crashes += int(stat.crashes)
+    found_bug += int(stat.crashes and not stat.is_semantic_error)
+  build_success_rate = compiles / len(target_stats)
+  crash_rate = crashes / len(target_stats)
+  max_coverage = max(stat.coverage for _, stat in target_stats)
   max_line_coverage_diff = max(
-      [stat.line_coverage_diff for _, stat in target_stats])
+      stat.line_coverage_diff for _, stat in target_stats)
 
   max_coverage_sample = ''
   max_coverage_diff_sample = ''
@@ -239,19 +239,26 @@ def run(benchmark: Benchmark,
         if benchmarklib.is_c_file(f) or benchmarklib.is_cpp_file(f)
     ]
   else:
-    if benchmark.use_project_examples:
-      project_examples = project_targets.generate_data(
-          benchmark.project,
-          benchmark.language,
-          cloud_experiment_bucket=cloud_experiment_bucket)
-    else:
-      project_examples = []
+    # Project examples and context are fetched from independent remote
+    # sources, so overlap them.
+    with pool.ThreadPool(2) as p:
+      if benchmark.use_project_examples:
+        project_examples_result = p.apply_async(
+            project_targets.generate_data,
+            (benchmark.project, benchmark.language),
+            {'cloud_experiment_bucket': cloud_experiment_bucket})
+      else:
+        project_examples_result = None
 
-    if use_context:
-      retriever = ContextRetriever(benchmark)
-      context_info = retriever.get_context_info()
-    else:
-      context_info = {}
+      if use_context:
+        retriever = ContextRetriever(benchmark)
+        context_info_result = p.apply_async(retriever.get_context_info)
+      else:
+        context_info_result = None
+
+      project_examples = (project_examples_result.get()
+                          if project_examples_result else [])
+      context_info = context_info_result.get() if context_info_result else {}
 
     if benchmark.language == 'jvm':
       # For Java projects